@@ -1,178 +1,432 @@
-import pandas as pd
+import copy
+import os
+import threading
+import time
+
+import numpy as np
 import plotly.express as px
 import dash
-from dash import dcc, html, ctx
+from dash import dash_table, dcc, html, ctx
 from dash.dependencies import Input, Output, State
 from dash.exceptions import PreventUpdate
+from flask import request
 
-# Load dataset
-df = pd.read_csv(r'input.csv')
+from aggregates import (AuditDiff, ComponentClusters, CountCube, FilterEngine, TrendRollup, active_filters, merge_rule_counts,
+                        query_table, rule_impact_counts)
+from callback_cache import CallbackCache, MemoryBackend, SQLiteBackend, normalize_selection
+from dataset import (CACHE_VERSION, append_rows, clean_frame, dataset_version, load_dataset, load_snapshot, selector_pattern,
+                     split_frame)
+from ingest import LiveIngestor
+from metrics import Metrics
+from taxonomy import TaxonomyFile
 
 impact_order = ['critical', 'serious', 'moderate', 'minor']
-df['Impact'] = pd.Categorical(df['Impact'], categories=impact_order, ordered=True)
-
-# Define rule categories mapping
-rule_categories = {
-    # ARIA-related Issues
-    'aria-role-missing': 'ARIA Issues', 'aria-state-property-missing': 'ARIA Issues',
-    'aria-name-missing-incorrect': 'ARIA Issues', 'aria-required-missing': 'ARIA Issues',
-    'aria-dialog-name': 'ARIA Issues', 'aria-allowed-attr': 'ARIA Issues', 'aria-required-parent': 'ARIA Issues',
-    'aria-role-invalid': 'ARIA Issues', 'aria-allowed-role': 'ARIA Issues', 'nested-interactive': 'ARIA Issues',
-    'presentation-role-conflict': 'ARIA Issues',
-
-    # Contrast and Color-related Issues
-    'contrast-link-infocus-4.5-1': 'Contrast and Color', 'contrast-text-4.5-1': 'Contrast and Color',
-    'contrast-text-4.5-1-placeholder': 'Contrast and Color', 'color-contrast': 'Contrast and Color',
-    'form-errors-color-only': 'Contrast and Color',
-
-    # Focus and Keyboard Accessibility
-    'keyboard-inaccessible': 'Focus and Keyboard', 'focus-on-hidden-item': 'Focus and Keyboard',
-    'focus-indicator-missing': 'Focus and Keyboard', 'focus-modal-moves-outside': 'Focus and Keyboard',
-    'focus-modal-none': 'Focus and Keyboard', 'focus-modal-not-returned': 'Focus and Keyboard',
-    'tab-order-illogical': 'Focus and Keyboard',
-
-    # Headings and Semantic Structure
-    'semantic-heading': 'Headings and Structure', 'semantic-incorrect': 'Headings and Structure',
-    'semantic-list': 'Headings and Structure', 'semantic-hidden': 'Headings and Structure',
-    'heading-order': 'Headings and Structure', 'heading-level-increase': 'Headings and Structure',
-    'heading-level-order': 'Headings and Structure', 'semantic-heading-misused': 'Headings and Structure',
-    'heading-not-descriptive': 'Headings and Structure',
-
-    # Image and Alt-text Issues
-    'alt-text-decorative-inappropriate': 'Image and Alt-text', 'alt-text-missing': 'Image and Alt-text',
-    'alt-text-short-text-not-meaningful': 'Image and Alt-text', 'image-alt': 'Image and Alt-text',
-    'image-of-text': 'Image and Alt-text', 'input-image-alt': 'Image and Alt-text',
-
-    # Landmarks and Structural Issues
-    'landmark-complementary-is-top-level': 'Landmarks and Structure', 'landmark-one-main': 'Landmarks and Structure',
-    'landmark-unique': 'Landmarks and Structure', 'landmark-no-duplicate-banner': 'Landmarks and Structure',
-    'landmark-no-duplicate-contentinfo': 'Landmarks and Structure',
-
-    # Form and Labeling Issues
-    'button-name': 'Forms and Labeling', 'label': 'Forms and Labeling', 'title-not-meaningful': 'Forms and Labeling',
-    'title-not-unique': 'Forms and Labeling', 'label-is-placeholder': 'Forms and Labeling',
-    'label-programmatic-not-descriptive': 'Forms and Labeling', 'label-group-not-associated': 'Forms and Labeling',
-    'label-group-radio-not-associated': 'Forms and Labeling',
-
-    # Dialog, Modal, and Timeout Issues
-    'custom-dialog': 'Dialogs and Modals', 'modal-no-esc': 'Dialogs and Modals',
-    'timeout-no-warning': 'Dialogs and Modals', 'timeout-not-announced': 'Dialogs and Modals',
-
-    # Navigation and Unexpected Behavior
-    'custom-navigation': 'Navigation', 'semantic-nav': 'Navigation',
-    'link-in-text-block': 'Navigation', 'unexpected-change-on-focus': 'Navigation'
-}
-
-df['Rule Category'] = df['Rule ID'].map(rule_categories).fillna('Other')
+
+BREAKDOWN_PAGE_SIZE = 25
+
+# Findings listed when drilling into a breakdown row, and the detail columns shown for them
+DRILL_DOWN_LIMIT = 50
+DETAIL_COLUMNS = ['Selector', 'Summary', 'Source Code', 'Test URL', 'Share URL']
+
+# (Category, Difficulty, Effort Required) shown in the effort-estimates modal and in batch reports
+effort_estimates = [
+    ("ARIA Issues", "Medium-High", "Requires knowledge of screen readers and ARIA roles"),
+    ("Contrast & Color", "Low", "Simple CSS fixes, but may require design adjustments"),
+    ("Focus & Keyboard", "High", "Requires testing keyboard navigation and proper focus handling"),
+    ("Headings & Structure", "Medium", "Mostly HTML changes, but needs thoughtful restructuring"),
+    ("Images & Alt-text", "Low-Medium", "Adding alt-text is easy, but verifying meaningful descriptions takes effort"),
+    ("Landmarks & Structure", "Medium", "ARIA landmark usage can be subtle and must be tested thoroughly"),
+    ("Forms & Labeling", "High", "Ensuring proper labels, associating elements correctly"),
+    ("Dialogs & Modals", "High", "Managing focus when a modal opens/closes is tricky"),
+    ("Navigation & Unexpected Behavior", "High", "Can involve significant JS refactoring to prevent unwanted page changes")
+]
+
+# Rule ID -> Rule Category taxonomy, loaded from rules.txt and reloaded when the file changes
+taxonomy_file = TaxonomyFile(os.environ.get('EAA_RULES', r'rules.txt'))
+taxonomy = taxonomy_file.taxonomy
+
+# Load dataset (from the columnar cache in .eaa_cache/ when the input is unchanged). EAA_INPUT can point
+# at a merged export written by `python ingest.py` (.csv or .parquet) instead of input.csv.
+# Only the columns the callbacks read stay in memory; Selector, Source Code, URLs and the other
+# free-text columns are read from the on-disk detail store when a user drills into findings
+data_path = os.environ.get('EAA_INPUT', r'input.csv')
+# Taken before loading: live ingestion resumes from here, rows appended meanwhile are deduplicated on Unique ID
+data_stat = os.stat(data_path)
+
+# Optional comparison audit: EAA_BASELINE=<earlier export, or a cached .feather/.pkl core file> adds a
+# "changes since baseline" view with new / fixed / persisting findings matched on Unique string identifier.
+# To compare against the previous audit after replacing input.csv, point EAA_BASELINE at the core file
+# of that audit (.eaa_cache/input.csv.<key>.feather, named in input.csv.meta.json before the swap); the
+# cache rebuild keeps the file referenced here and removes the other outdated ones
+baseline_path = os.environ.get('EAA_BASELINE')
+df, details, data_digest = load_dataset(data_path, impact_order, taxonomy, keep=[baseline_path] if baseline_path else ())
+baseline, baseline_digest = load_snapshot(baseline_path, impact_order, taxonomy) if baseline_path else (None, None)
+
+class DashboardState:
+    """The loaded findings and every aggregate built from them, as one snapshot.
+
+    A state is never modified: live ingestion and rules.txt reloads build a complete new one
+    and publish it with a single assignment, so a callback that reads ``state`` once sees the
+    frame, detail store and aggregates of the same version.
+    """
+
+    def __init__(self, df, details, taxonomy, baseline=None, digests=(), loaded_rows=None):
+        self.df, self.details, self.taxonomy, self.baseline = df, details, taxonomy, baseline
+        # sha256 of the loaded export (and baseline); rows past loaded_rows came from live ingestion
+        self.digests = digests
+        self.loaded_rows = len(df) if loaded_rows is None else loaded_rows
+        # Precomputed Test Title x Rule Category x Impact counts answering the chart and totals
+        self.cube = CountCube(df, impact_order)
+        # Rule Category x Rule ID x Impact counts backing the breakdown table
+        self.rule_counts = rule_impact_counts(df)
+        # Created At rollups (day/week/month) backing the trend chart
+        self.trends = TrendRollup(df, impact_order)
+        # Per-value row bitmaps over Test Title, Rule Category, Impact, Brand, Country, Found By and Tags;
+        # answers any combination of the dashboard filters the precomputed aggregates above cannot
+        self.filter_engine = FilterEngine(df)
+        # Findings repeated across sibling elements grouped per Test Title, Rule ID and selector pattern,
+        # with the same chart and breakdown counts over one row per cluster for the "unique components" view
+        self.clusters = ComponentClusters(df)
+        self.component_cube = CountCube(df.iloc[self.clusters.representatives], impact_order)
+        self.component_rule_counts = rule_impact_counts(df.iloc[self.clusters.representatives])
+        # Hash join of the current findings against the baseline audit's
+        self.audit_diff = AuditDiff(df['Finding Key'], baseline) if baseline is not None else None
+        self.version = self._version()
+
+    def _version(self):
+        # Keyed on file contents, so an export re-issued with the same IDs but corrected values does not
+        # get results cached for the old one (CACHE_VERSION is bumped when the results are built differently)
+        parts = [str(CACHE_VERSION), *(digest[:16] for digest in self.digests), self.taxonomy.fingerprint[:12]]
+        if len(self.df) > self.loaded_rows:
+            parts.append(dataset_version(self.df.iloc[self.loaded_rows:]))
+        return '-'.join(parts)
+
+    def extended(self, rows):
+        """New state with cleaned ``rows`` appended; only the new rows are aggregated."""
+        # The rows may have been cleaned just before a rules.txt reload
+        rows = rows.assign(**{'Rule Category': self.taxonomy.classify_column(rows['Rule ID'])})
+        rows, detail = split_frame(rows)
+        offset = len(self.df)
+        state = copy.copy(self)
+        state.details = self.details.extended(detail)
+        state.filter_engine = self.filter_engine.extended(rows, offset)
+        state.clusters = self.clusters.extended(rows, offset)
+        new_components = rows.iloc[state.clusters.representatives[len(self.clusters):] - offset]
+        state.component_cube = self.component_cube.extended(new_components)
+        state.component_rule_counts = merge_rule_counts(self.component_rule_counts, new_components)
+        state.df = append_rows(self.df, rows)
+        state.cube, state.rule_counts = self.cube.extended(rows), merge_rule_counts(self.rule_counts, rows)
+        state.trends = self.trends.extended(rows)
+        if self.baseline is not None:
+            state.audit_diff = AuditDiff(state.df['Finding Key'], self.baseline)
+        state.version = state._version()
+        return state
+
+    def reclassified(self, taxonomy):
+        # Only the distinct Rule IDs are reclassified; the aggregates keyed on Rule Category are rebuilt
+        df = self.df.copy(deep=False)
+        df['Rule Category'] = taxonomy.classify_column(df['Rule ID'])
+        baseline = self.baseline
+        if baseline is not None:
+            baseline = baseline.assign(**{'Rule Category': taxonomy.classify_column(baseline['Rule ID'])})
+        return DashboardState(df, self.details, taxonomy, baseline, self.digests, self.loaded_rows)
+
+    def criterion_tags(self):
+        return [t for t in self.filter_engine.values('Tags') if t.startswith(('wcag', 'EN-'))]
+
+
+state = DashboardState(df, details, taxonomy, baseline, tuple(d for d in (data_digest, baseline_digest) if d))
+del df, details, baseline, taxonomy  # read through ``state`` from here on
+# Serializes the writers (live ingestion, rules.txt reloads) so neither builds on a state the other replaces
+state_lock = threading.Lock()
+
+
+def selection_key(filters):
+    return tuple(sorted((dim, normalize_selection(values)) for dim, values in filters.items()))
+
+
+# Per-callback phase timings, response sizes and cache lookups (EAA_METRICS=1); /metrics always
+# serves the memory gauges and cache counters
+metrics = Metrics(enabled=bool(os.environ.get('EAA_METRICS')))
+
+# Memoized callback results; EAA_CALLBACK_CACHE=<sqlite file> shares them between gunicorn workers
+cache_size = int(os.environ.get('EAA_CALLBACK_CACHE_SIZE', 256))
+if os.environ.get('EAA_CALLBACK_CACHE'):
+    cache_backend = SQLiteBackend(os.environ['EAA_CALLBACK_CACHE'], cache_size)
+else:
+    cache_backend = MemoryBackend(cache_size)
+callback_cache = CallbackCache(cache_backend, state.version, on_lookup=metrics.record_cache)
+
+
+def publish(new_state):
+    global state
+    state = new_state
+    callback_cache.set_version(new_state.version)
+
+
+def apply_new_rows(rows):
+    with state_lock:
+        publish(state.extended(rows))
+
+
+def reload_taxonomy(new_taxonomy):
+    with state_lock:
+        publish(state.reclassified(new_taxonomy))
+
+
+# Optional live ingestion: EAA_WATCH=1 polls the input CSV (and EAA_DROP_DIR, if set) for new findings;
+# a merged .parquet EAA_INPUT cannot be tailed, so only EAA_DROP_DIR is watched then. The polling thread
+# is started by each serving process on its first request (see start_live_ingestion)
+live_ingestor = None
+if os.environ.get('EAA_WATCH'):
+    live_ingestor = LiveIngestor(
+        data_path, state.df, lambda rows: clean_frame(rows, impact_order, state.taxonomy), apply_new_rows,
+        drop_dir=os.environ.get('EAA_DROP_DIR'), interval=float(os.environ.get('EAA_WATCH_INTERVAL', 5)),
+        loaded_stat=data_stat
+    )
+    # Rows already in the drop directory are not part of the loaded input; apply them before serving
+    live_ingestor.poll()
 
 # Initialize Dash App
 app = dash.Dash(__name__)
 
-# Custom Styling
-app.layout = html.Div([
-    html.H1("Accessibility Audit Dashboard", style={'text-align': 'center', 'color': '#2c3e50', 'font-family': 'Arial, sans-serif', 'font-weight': 'bold'}),
-
-    html.Div([
-        dcc.Dropdown(
-            id='test-title-dropdown',
-            options=[{'label': 'All', 'value': 'All'}] + [{'label': t, 'value': t} for t in df['Test Title'].unique()],
-            value=['All'], multi=True,
-            placeholder="Select Test Titles",
-            style={'width': '50%', 'margin': 'auto', 'font-family': 'Arial, sans-serif'}
-        ),
-    ], style={'text-align': 'center', 'margin-bottom': '20px'}),
+# Custom Styling (layout is built per page load so new sessions see rows added by live ingestion)
+def serve_layout():
+    snapshot = state
+    return html.Div([
+        html.H1("Accessibility Audit Dashboard", style={'text-align': 'center', 'color': '#2c3e50', 'font-family': 'Arial, sans-serif', 'font-weight': 'bold'}),
 
-    dcc.Store(id='selected-categories', data=[]),
+        html.Div([
+            dcc.Dropdown(
+                id='test-title-dropdown',
+                options=[{'label': 'All', 'value': 'All'}] + [{'label': t, 'value': t} for t in snapshot.df['Test Title'].unique()],
+                value=['All'], multi=True,
+                placeholder="Select Test Titles",
+                style={'width': '50%', 'margin': 'auto', 'font-family': 'Arial, sans-serif'}
+            ),
+        ], style={'text-align': 'center', 'margin-bottom': '20px'}),
 
-    html.Div(id="total-issues-summary", style={'text-align': 'center', 'font-size': '18px', 'font-weight': 'bold', 'font-family': 'Arial, sans-serif', 'margin-bottom': '15px'}),
+        html.Div([
+            dcc.Dropdown(
+                id='criterion-selector',
+                options=[{'label': t, 'value': t} for t in snapshot.criterion_tags()],
+                value=[], multi=True,
+                placeholder="Filter by WCAG / EN criterion",
+                style={'width': '50%', 'margin': 'auto', 'font-family': 'Arial, sans-serif'}
+            ),
+        ], style={'text-align': 'center', 'margin-bottom': '20px'}),
 
-    dcc.Graph(id='category-bar-chart', style={'margin': 'auto', 'padding': '20px'}),
+        html.Div([
+            dcc.Dropdown(
+                id=component_id,
+                options=[{'label': v, 'value': v} for v in values],
+                value=[], multi=True,
+                placeholder=placeholder,
+                style={'width': '100%', 'font-family': 'Arial, sans-serif'}
+            )
+            for component_id, values, placeholder in [
+                ('impact-selector', impact_order, "All Severities"),
+                ('brand-selector', snapshot.filter_engine.values('Brand'), "All Brands"),
+                ('country-selector', snapshot.filter_engine.values('Country'), "All Countries"),
+                ('found-by-selector', snapshot.filter_engine.values('Found By'), "Found By: anyone"),
+            ]
+        ], style={'display': 'grid', 'grid-template-columns': 'repeat(4, 1fr)', 'gap': '10px', 'width': '80%',
+                  'margin': 'auto', 'margin-bottom': '20px'}),
+
+        # Shared cross-filter selection read by the chart, breakdown and trend callbacks
+        dcc.Store(id='filter-selection', data={}),
 
-    # Button to open modal
-    html.Button("Accessibility Effort Estimates", id="open-modal", n_clicks=0, 
-                style={'background-color': '#4a90e2', 'color': 'white', 'padding': '12px 20px', 'border': 'none',
-                       'border-radius': '6px', 'cursor': 'pointer', 'font-size': '16px', 'font-weight': 'bold',
-                       'box-shadow': '2px 2px 8px rgba(0, 0, 0, 0.2)', 'transition': '0.3s', 'margin-bottom': '10px'}),
+        html.Div([
+            dcc.Checklist(
+                id='unique-components',
+                options=[{'label': ' Unique components (count repeated findings on one component once)', 'value': 'unique'}],
+                value=[], inline=True,
+                style={'font-family': 'Arial, sans-serif'}
+            ),
+            dcc.RadioItems(
+                id='diff-mode',
+                options=[{'label': ' Current audit', 'value': 'current'},
+                         {'label': ' Changes since baseline', 'value': 'diff'}],
+                value='current', inline=True,
+                style={'font-family': 'Arial, sans-serif', 'margin-top': '10px',
+                       'display': 'block' if snapshot.audit_diff is not None else 'none'}
+            ),
+        ], style={'text-align': 'center', 'margin-bottom': '15px'}),
+
+        html.Div(id="total-issues-summary", style={'text-align': 'center', 'font-size': '18px', 'font-weight': 'bold', 'font-family': 'Arial, sans-serif', 'margin-bottom': '15px'}),
+
+        dcc.Graph(id='category-bar-chart', style={'margin': 'auto', 'padding': '20px'}),
+
+        # Button to open modal
+        html.Button("Accessibility Effort Estimates", id="open-modal", n_clicks=0, 
+                    style={'background-color': '#4a90e2', 'color': 'white', 'padding': '12px 20px', 'border': 'none',
+                           'border-radius': '6px', 'cursor': 'pointer', 'font-size': '16px', 'font-weight': 'bold',
+                           'box-shadow': '2px 2px 8px rgba(0, 0, 0, 0.2)', 'transition': '0.3s', 'margin-bottom': '10px'}),
+
+        # Modal (Hidden by default)
+        html.Div([
+            html.Div([
+                html.H3("Accessibility Effort Estimates", style={'margin-bottom': '10px', 'color': '#2c3e50', 'font-weight': 'bold'}),
+                html.Table([
+                    html.Tr([
+                        html.Th("Category", style={'background-color': '#2c3e50', 'color': 'white', 'padding': '10px'}),
+                        html.Th("Difficulty", style={'background-color': '#2c3e50', 'color': 'white', 'padding': '10px'}),
+                        html.Th("Effort Required", style={'background-color': '#2c3e50', 'color': 'white', 'padding': '10px'})
+                    ])
+                ] + [
+                    html.Tr([
+                        html.Td(category, style={'padding': '8px', 'border': '1px solid #ddd'}),
+                        html.Td(difficulty, style={'padding': '8px', 'border': '1px solid #ddd'}),
+                        html.Td(effort, style={'padding': '8px', 'border': '1px solid #ddd'})
+                    ])
+                    for category, difficulty, effort in effort_estimates
+                ], style={'margin': 'auto', 'border-collapse': 'collapse', 'width': '80%', 'font-size': '16px'}),
+                html.Button("Close", id="close-modal", n_clicks=0, style={'margin-top': '10px', 'background-color': '#e74c3c',
+                                                                           'color': 'white', 'border': 'none', 'padding': '10px 18px',
+                                                                           'border-radius': '6px', 'cursor': 'pointer', 'font-size': '14px',
+                                                                           'font-weight': 'bold'}),
+            ], id="modal-box", style={
+                'padding': '25px', 'background-color': 'white', 'border-radius': '10px', 'border': '2px solid #4a90e2',
+                'position': 'absolute', 'top': '20%', 'left': '5%', 'width': '55%', 'box-shadow': '4px 4px 15px rgba(0, 0, 0, 0.2)',
+                'display': 'none'
+            })
+        ]),
 
-    # Modal (Hidden by default)
-    html.Div([
         html.Div([
-            html.H3("Accessibility Effort Estimates", style={'margin-bottom': '10px', 'color': '#2c3e50', 'font-weight': 'bold'}),
-            html.Table([
-                html.Tr([
-                    html.Th("Category", style={'background-color': '#2c3e50', 'color': 'white', 'padding': '10px'}),
-                    html.Th("Difficulty", style={'background-color': '#2c3e50', 'color': 'white', 'padding': '10px'}),
-                    html.Th("Effort Required", style={'background-color': '#2c3e50', 'color': 'white', 'padding': '10px'})
-                ])
-            ] + [
-                html.Tr([
-                    html.Td(category, style={'padding': '8px', 'border': '1px solid #ddd'}),
-                    html.Td(difficulty, style={'padding': '8px', 'border': '1px solid #ddd'}),
-                    html.Td(effort, style={'padding': '8px', 'border': '1px solid #ddd'})
-                ])
-                for category, difficulty, effort in [
-                    ("ARIA Issues", "Medium-High", "Requires knowledge of screen readers and ARIA roles"),
-                    ("Contrast & Color", "Low", "Simple CSS fixes, but may require design adjustments"),
-                    ("Focus & Keyboard", "High", "Requires testing keyboard navigation and proper focus handling"),
-                    ("Headings & Structure", "Medium", "Mostly HTML changes, but needs thoughtful restructuring"),
-                    ("Images & Alt-text", "Low-Medium", "Adding alt-text is easy, but verifying meaningful descriptions takes effort"),
-                    ("Landmarks & Structure", "Medium", "ARIA landmark usage can be subtle and must be tested thoroughly"),
-                    ("Forms & Labeling", "High", "Ensuring proper labels, associating elements correctly"),
-                    ("Dialogs & Modals", "High", "Managing focus when a modal opens/closes is tricky"),
-                    ("Navigation & Unexpected Behavior", "High", "Can involve significant JS refactoring to prevent unwanted page changes")
-                ]
-            ], style={'margin': 'auto', 'border-collapse': 'collapse', 'width': '80%', 'font-size': '16px'}),
-            html.Button("Close", id="close-modal", n_clicks=0, style={'margin-top': '10px', 'background-color': '#e74c3c',
-                                                                       'color': 'white', 'border': 'none', 'padding': '10px 18px',
-                                                                       'border-radius': '6px', 'cursor': 'pointer', 'font-size': '14px',
-                                                                       'font-weight': 'bold'}),
-        ], id="modal-box", style={
-            'padding': '25px', 'background-color': 'white', 'border-radius': '10px', 'border': '2px solid #4a90e2',
-            'position': 'absolute', 'top': '20%', 'left': '5%', 'width': '55%', 'box-shadow': '4px 4px 15px rgba(0, 0, 0, 0.2)',
-            'display': 'none'
-        })
-    ]),
-
-    html.Div([
-        dcc.Dropdown(
-            id='category-selector',
-            options=[{'label': cat, 'value': cat} for cat in df['Rule Category'].unique()],
-            value=[], multi=True,
-            placeholder="Select Categories",
-            style={'width': '50%', 'margin': 'auto', 'margin-top': '20px', 'margin-bottom': '30px', 'font-family': 'Arial, sans-serif'}
-        ),
-    ]),
+            dcc.Dropdown(
+                id='category-selector',
+                options=[{'label': cat, 'value': cat} for cat in snapshot.df['Rule Category'].unique()],
+                value=[], multi=True,
+                placeholder="Select Categories",
+                style={'width': '50%', 'margin': 'auto', 'margin-top': '20px', 'margin-bottom': '30px', 'font-family': 'Arial, sans-serif'}
+            ),
+        ]),
+
+        html.Div(id="rule-breakdown", style={'margin': 'auto', 'font-family': 'Arial, sans-serif'}),
+
+        # Breakdown grid: rows are filtered, sorted and paged on the server, one page per request
+        html.Div([
+            dash_table.DataTable(
+                id='rule-breakdown-table',
+                columns=[{'name': 'Rule ID', 'id': 'Rule ID'}, {'name': 'Severity', 'id': 'Impact'},
+                         {'name': 'Count', 'id': 'count', 'type': 'numeric'}],
+                data=[], page_current=0, page_size=BREAKDOWN_PAGE_SIZE, page_count=1,
+                page_action='custom', sort_action='custom', sort_mode='multi', sort_by=[],
+                filter_action='custom', filter_query='', filter_options={'case': 'insensitive'},
+                style_table={'width': '80%', 'margin': 'auto'},
+                style_header={'padding': '15px', 'text-align': 'center', 'background-color': '#2c3e50', 'color': 'white',
+                              'font-family': 'Arial, sans-serif', 'font-size': '18px'},
+                style_cell={'padding': '15px', 'text-align': 'center', 'border': '1px solid #ddd',
+                            'font-family': 'Arial, sans-serif', 'font-size': '18px'}
+            ),
+        ], id="rule-breakdown-grid", style={'display': 'none'}),
+
+        html.Div(id="finding-details", style={'width': '80%', 'margin': 'auto', 'margin-top': '20px', 'font-family': 'Arial, sans-serif'}),
+
+        html.Div(id="selected-summary", style={'text-align': 'center', 'font-size': '16px', 'color': '#333', 'font-family': 'Arial, sans-serif'}),
+
+        # Issue trend over Created At
+        html.H2("Issue Trend", style={'text-align': 'center', 'color': '#2c3e50', 'font-family': 'Arial, sans-serif', 'margin-top': '40px'}),
+
+        html.Div([
+            dcc.RadioItems(
+                id='trend-granularity',
+                options=[{'label': g.capitalize(), 'value': g} for g in TrendRollup.GRANULARITIES],
+                value='week', inline=True,
+                style={'font-family': 'Arial, sans-serif', 'margin-bottom': '10px'}
+            ),
+        ], style={'text-align': 'center', 'margin-bottom': '20px'}),
+
+        dcc.Graph(id='trend-chart', style={'margin': 'auto', 'padding': '20px'})
+    ])
+
 
-    html.Div(id="rule-breakdown", style={'margin': 'auto', 'font-family': 'Arial, sans-serif'}),
+app.layout = serve_layout
+
+# Collect every filter into one selection in the browser, no server round trip
+app.clientside_callback(
+    """
+    function(titles, categories, criteria, impacts, brands, countries, foundBy) {
+        return {
+            'Test Title': titles || [], 'Rule Category': categories || [], 'Tags': criteria || [],
+            'Impact': impacts || [], 'Brand': brands || [], 'Country': countries || [], 'Found By': foundBy || []
+        };
+    }
+    """,
+    Output('filter-selection', 'data'),
+    Input('test-title-dropdown', 'value'),
+    Input('category-selector', 'value'),
+    Input('criterion-selector', 'value'),
+    Input('impact-selector', 'value'),
+    Input('brand-selector', 'value'),
+    Input('country-selector', 'value'),
+    Input('found-by-selector', 'value')
+)
 
-    html.Div(id="selected-summary", style={'text-align': 'center', 'font-size': '16px', 'color': '#333', 'font-family': 'Arial, sans-serif'})
-])
 
 @app.callback(
     Output('category-bar-chart', 'figure'),
     Output('total-issues-summary', 'children'),
-    Input('test-title-dropdown', 'value')
+    Input('filter-selection', 'data'),
+    Input('unique-components', 'value'),
+    Input('diff-mode', 'value')
 )
-def update_chart(selected_tests):
-    if "All" in selected_tests or not selected_tests:
-        filtered_df = df
+@metrics.instrument('update_chart')
+def update_chart(selection, unique=None, mode=None):
+    selected_tests = (selection or {}).get('Test Title') or []
+    selected_criteria = (selection or {}).get('Tags') or []
+
+    # The chart is grouped by Rule Category, so the category filter only drives the breakdown
+    filters = active_filters(selection, exclude=['Rule Category'])
+    snapshot = state
+    if mode == 'diff' and snapshot.audit_diff is not None:
+        figure, total_summary = callback_cache.get_or_compute(
+            'update_chart', ('diff', selection_key(filters)), lambda: build_diff_chart(filters, snapshot),
+            version=snapshot.version)
     else:
-        filtered_df = df[df['Test Title'].isin(selected_tests)]
-
-    total_issues_selected = len(filtered_df)
-    total_issues_all = len(df)
-    percentage_selected = (total_issues_selected / total_issues_all) * 100
-
-    total_summary = f"Total Issues:\n{total_issues_selected}\n{percentage_selected:.2f}% of all issues"
-
-    grouped_df = filtered_df.groupby(['Rule Category', 'Impact']).size().reset_index(name='count')
+        unique = bool(unique)
+        figure, total_summary = callback_cache.get_or_compute(
+            'update_chart', (unique, selection_key(filters)), lambda: build_chart(filters, unique, snapshot),
+            version=snapshot.version)
+
+    # The title follows the raw selection order, so it is applied after the cached figure
+    title = "Accessibility Issues Overview" if "All" in selected_tests else f"Issues for {', '.join(selected_tests)}"
+    if selected_criteria:
+        title += f" ({', '.join(selected_criteria)})"
+    return {**figure, 'layout': {**figure['layout'], 'title': {'text': title}}}, total_summary
+
+
+def build_chart(filters, unique=False, snapshot=None):
+    snapshot = snapshot or state
+    timer = metrics.timer()
+    counts = snapshot.component_cube if unique else snapshot.cube
+    if set(filters) <= {'Test Title'}:
+        titles = filters.get('Test Title')
+        total_issues_selected = counts.row_count(titles)
+        timer.lap('filter')
+        grouped_df = counts.category_impact_frame(titles)
+    else:
+        rows = snapshot.filter_engine.rows(filters)
+        if unique:
+            rows = snapshot.clusters.first_rows(rows)
+        total_issues_selected = len(rows)
+        timer.lap('filter')
+        grouped_df = CountCube(snapshot.df.iloc[rows], impact_order).category_impact_frame()
+    timer.lap('groupby')
+
+    percentage_selected = (total_issues_selected / counts.total) * 100
+
+    if unique:
+        total_summary = f"Unique Components:\n{total_issues_selected}\n{percentage_selected:.2f}% of all components"
+    else:
+        total_summary = f"Total Issues:\n{total_issues_selected}\n{percentage_selected:.2f}% of all issues"
 
     fig = px.bar(
         grouped_df,
         x="Rule Category",
         y="count",
         color="Impact",
-        title="Accessibility Issues Overview" if "All" in selected_tests else f"Issues for {', '.join(selected_tests)}",
+        title="Accessibility Issues Overview",  # replaced per request in update_chart
         color_discrete_map={
             "critical": "#e74c3c",  # Red
             "serious": "#e67e22",   # Orange
@@ -181,78 +435,302 @@ def update_chart(selected_tests):
         }
     )
 
-    return fig, total_summary
+    figure = fig.to_plotly_json()
+    timer.lap('figure')
+    return figure, total_summary
 
-@app.callback(
-    Output('selected-categories', 'data'),
-    Input('category-selector', 'value')
-)
-def store_selected_categories(dropdown_categories):
-    return dropdown_categories  
+
+def diff_summary(label, table):
+    new, fixed, persisting = (int(table[s].sum()) for s in AuditDiff.STATUSES)
+    return f"{label} since baseline:\n{new} new, {fixed} fixed, {persisting} persisting\n({new - fixed:+d} net)"
+
+
+def build_diff_chart(filters, snapshot):
+    timer = metrics.timer()
+    rows = snapshot.filter_engine.rows(filters)
+    timer.lap('filter')
+    table = snapshot.audit_diff.counts(snapshot.df, rows, filters, ['Rule Category'])
+    timer.lap('groupby')
+
+    fig = px.bar(
+        table.melt(id_vars='Rule Category', var_name='Status', value_name='count'),
+        x="Rule Category",
+        y="count",
+        color="Status",
+        title="Accessibility Issues Overview",  # replaced per request in update_chart
+        category_orders={'Status': AuditDiff.STATUSES},
+        color_discrete_map={
+            "new": "#e74c3c",         # Red
+            "fixed": "#2ecc71",       # Green
+            "persisting": "#95a5a6"   # Grey
+        }
+    )
+
+    figure = fig.to_plotly_json()
+    timer.lap('figure')
+    return figure, diff_summary("Issues", table)
 
 
 @app.callback(
     [Output('rule-breakdown', 'children'),
+     Output('rule-breakdown-grid', 'style'),
+     Output('rule-breakdown-table', 'data'),
+     Output('rule-breakdown-table', 'page_count'),
      Output('selected-summary', 'children')],
-    Input('selected-categories', 'data')
+    Input('filter-selection', 'data'),
+    Input('rule-breakdown-table', 'page_current'),
+    Input('rule-breakdown-table', 'page_size'),
+    Input('rule-breakdown-table', 'sort_by'),
+    Input('rule-breakdown-table', 'filter_query'),
+    Input('unique-components', 'value'),
+    Input('diff-mode', 'value')
+)
+@metrics.instrument('display_selected_categories')
+def display_selected_categories(selection, page_current=0, page_size=BREAKDOWN_PAGE_SIZE, sort_by=None, filter_query='',
+                                unique=None, mode=None):
+    if not (selection or {}).get('Rule Category'):
+        return html.Div("Select categories via dropdown.", style={'text-align': 'center', 'font-style': 'italic', 'font-family': 'Arial, sans-serif'}), {'display': 'none'}, [], 1, ""
+
+    filters = active_filters(selection)
+    snapshot = state
+    if mode == 'diff' and snapshot.audit_diff is not None:
+        grouped_data, selected_summary = callback_cache.get_or_compute(
+            'display_selected_categories', ('diff', selection_key(filters)), lambda: build_diff_breakdown(filters, snapshot),
+            version=snapshot.version)
+    else:
+        unique = bool(unique)
+        grouped_data, selected_summary = callback_cache.get_or_compute(
+            'display_selected_categories', (unique, selection_key(filters)),
+            lambda: build_category_breakdown(filters, unique, snapshot), version=snapshot.version)
+
+    timer = metrics.timer()
+    page, page_count = query_table(grouped_data, sort_by, filter_query, page_current or 0, page_size or BREAKDOWN_PAGE_SIZE)
+    timer.lap('page')
+    return None, {'display': 'block'}, page, page_count, selected_summary
+
+
+def build_category_breakdown(filters, unique=False, snapshot=None):
+    snapshot = snapshot or state
+    timer = metrics.timer()
+    if unique:
+        counts, by_rule = snapshot.component_cube, snapshot.component_rule_counts
+    else:
+        counts, by_rule = snapshot.cube, snapshot.rule_counts
+    if set(filters) == {'Rule Category'}:
+        # Rule ID / Severity counts for the selected categories, read from the precomputed rule counts
+        selected_categories = filters['Rule Category']
+        grouped_data = by_rule.loc[by_rule['Rule Category'].isin(selected_categories), ['Rule ID', 'Impact', 'count']]
+        total_selected_issues = counts.category_count(selected_categories)
+        timer.lap('filter')
+    else:
+        rows = snapshot.filter_engine.rows(filters)
+        if unique:
+            rows = snapshot.clusters.first_rows(rows)
+        timer.lap('filter')
+        grouped_data = rule_impact_counts(snapshot.df.iloc[rows])[['Rule ID', 'Impact', 'count']]
+        total_selected_issues = len(rows)
+        timer.lap('groupby')
+
+    total_selected_percentage = (total_selected_issues / counts.total) * 100
+
+    if unique:
+        selected_summary = f"Selected Unique Components:\n{total_selected_issues}\n{total_selected_percentage:.2f}% of all components"
+    else:
+        selected_summary = f"Total Selected Issues:\n{total_selected_issues}\n{total_selected_percentage:.2f}% of all issues"
+
+    return grouped_data, selected_summary
+
+
+def build_diff_breakdown(filters, snapshot):
+    timer = metrics.timer()
+    rows = snapshot.filter_engine.rows(filters)
+    timer.lap('filter')
+    table = snapshot.audit_diff.counts(snapshot.df, rows, filters, ['Rule ID', 'Impact'])
+    table['change'] = table['new'] - table['fixed']
+    timer.lap('groupby')
+    return table, diff_summary("Selected issues", table)
+
+
+@app.callback(
+    Output('rule-breakdown-table', 'columns'),
+    Input('diff-mode', 'value')
+)
+def breakdown_columns(mode):
+    columns = [{'name': 'Rule ID', 'id': 'Rule ID'}, {'name': 'Severity', 'id': 'Impact'}]
+    if mode == 'diff' and state.audit_diff is not None:
+        return columns + [{'name': name, 'id': name.lower(), 'type': 'numeric'}
+                          for name in ['New', 'Fixed', 'Persisting', 'Change']]
+    return columns + [{'name': 'Count', 'id': 'count', 'type': 'numeric'}]
+
+
+@app.callback(
+    Output('finding-details', 'children'),
+    Input('rule-breakdown-table', 'active_cell'),
+    State('rule-breakdown-table', 'data'),
+    State('filter-selection', 'data')
 )
-def display_selected_categories(selected_categories):
-    if not selected_categories:
-        return html.Div("Select categories via dropdown.", style={'text-align': 'center', 'font-style': 'italic', 'font-family': 'Arial, sans-serif'}), ""
-
-    # Filter dataframe based on selected categories
-    filtered_df = df[df['Rule Category'].isin(selected_categories)]
-    
-    # Group by Rule ID and Severity (Impact) while removing rows with count == 0
-    grouped_data = filtered_df.groupby(['Rule ID', 'Impact']).size().reset_index(name='count')
-    grouped_data = grouped_data[grouped_data['count'] > 0]  # Only keep rows with count > 0
-
-    total_selected_issues = len(filtered_df)
-    total_selected_percentage = (total_selected_issues / len(df)) * 100
-
-    selected_summary = f"Total Selected Issues:\n{total_selected_issues}\n{total_selected_percentage:.2f}% of all issues"
-
-    breakdown_table = html.Table([
-        html.Tr([
-            html.Th("Rule ID", style={'padding': '15px', 'text-align': 'center', 'background-color': '#2c3e50', 'color': 'white', 'font-family': 'Arial, sans-serif'}),
-            html.Th("Severity", style={'padding': '15px', 'text-align': 'center', 'background-color': '#2c3e50', 'color': 'white', 'font-family': 'Arial, sans-serif'}),
-            html.Th("Count", style={'padding': '15px', 'text-align': 'center', 'background-color': '#2c3e50', 'color': 'white', 'font-family': 'Arial, sans-serif'})
-        ])
-    ] + [
-        html.Tr([
-            html.Td(row["Rule ID"], style={'padding': '15px', 'text-align': 'center', 'border': '1px solid #ddd', 'font-family': 'Arial, sans-serif'}),
-            html.Td(row["Impact"], style={'padding': '15px', 'text-align': 'center', 'border': '1px solid #ddd', 'font-family': 'Arial, sans-serif'}),
-            html.Td(row["count"], style={'padding': '15px', 'text-align': 'center', 'border': '1px solid #ddd', 'font-family': 'Arial, sans-serif'})
-        ])
-        for _, row in grouped_data.iterrows()
-    ], style={'margin': 'auto', 'border-collapse': 'collapse', 'width': '80%', 'font-size': '18px'})
-
-    return breakdown_table, selected_summary
-
-# Callback to toggle modal visibility
+def show_finding_details(active_cell, page, selection):
+    if not active_cell or not page or active_cell['row'] >= len(page):
+        return None
+    rule_id, impact = page[active_cell['row']]['Rule ID'], page[active_cell['row']]['Impact']
+    snapshot = state
+    rows = snapshot.filter_engine.rows({**active_filters(selection), 'Impact': [impact]})
+    rows = rows[np.asarray(snapshot.df['Rule ID'].iloc[rows], dtype=object) == rule_id][:DRILL_DOWN_LIMIT]
+
+    # Only the listed findings are read from the detail store; merged exports lack some detail columns
+    findings = snapshot.details.rows(rows, [c for c in DETAIL_COLUMNS if c in snapshot.details.columns])
+    findings.insert(0, 'Test Title', np.asarray(snapshot.df['Test Title'].iloc[rows], dtype=object))
+    findings = findings.astype(object).where(findings.notna(), None)
+    return [
+        html.H3(f"{rule_id} ({impact}): first {len(rows)} findings", style={'text-align': 'center', 'color': '#2c3e50'}),
+        dash_table.DataTable(
+            columns=[{'name': c, 'id': c} for c in findings.columns],
+            data=findings.to_dict('records'),
+            style_table={'overflowX': 'auto'},
+            style_header={'background-color': '#2c3e50', 'color': 'white', 'font-family': 'Arial, sans-serif'},
+            style_cell={'text-align': 'left', 'font-family': 'Arial, sans-serif', 'font-size': '13px',
+                        'white-space': 'normal', 'max-width': '400px', 'overflow-wrap': 'anywhere'}
+        ),
+    ]
+
+
 @app.callback(
+    Output('trend-chart', 'figure'),
+    Input('trend-granularity', 'value'),
+    Input('filter-selection', 'data')
+)
+@metrics.instrument('update_trend')
+def update_trend(granularity, selection):
+    filters = active_filters(selection)
+    snapshot = state
+    return callback_cache.get_or_compute(
+        'update_trend', (granularity, selection_key(filters)), lambda: build_trend(granularity, filters, snapshot),
+        version=snapshot.version)
+
+
+def build_trend(granularity, filters, snapshot=None):
+    snapshot = snapshot or state
+    timer = metrics.timer()
+    if set(filters) <= {'Test Title', 'Rule Category'}:
+        series = snapshot.trends.series(granularity, filters.get('Test Title'), filters.get('Rule Category'))
+    else:
+        rows = snapshot.filter_engine.rows(filters)
+        timer.lap('filter')
+        series = snapshot.trends.series_for_rows(granularity, rows)
+    timer.lap('groupby')
+
+    fig = px.line(
+        series,
+        x="period",
+        y="count",
+        color="Impact",
+        markers=True,
+        title=f"Issues per {granularity}",
+        labels={'period': 'Created At'},
+        color_discrete_map={
+            "critical": "#e74c3c",
+            "serious": "#e67e22",
+            "moderate": "#f1c40f",
+            "minor": "#95a5a6"
+        }
+    )
+    figure = fig.to_plotly_json()
+    timer.lap('figure')
+    return figure
+
+# Callback to toggle modal visibility (runs in the browser)
+app.clientside_callback(
+    """
+    function(open_clicks, close_clicks) {
+        if (open_clicks && open_clicks > close_clicks) {
+            return {
+                'padding': '20px',
+                'background-color': 'white',
+                'border': '1px solid black',
+                'position': 'absolute',
+                'top': '20%',
+                'left': '5%',
+                'width': '60%',
+                'box-shadow': '2px 2px 10px rgba(0, 0, 0, 0.2)',
+                'display': 'block'
+            };
+        }
+        return {'display': 'none'};
+    }
+    """,
     Output("modal-box", "style"),
     [Input("open-modal", "n_clicks"),
      Input("close-modal", "n_clicks")],
     prevent_initial_call=True
 )
-def toggle_modal(open_clicks, close_clicks):
-    if open_clicks and open_clicks > close_clicks:
-        return {
-            'padding': '20px',
-            'background-color': 'white',
-            'border': '1px solid black',
-            'position': 'absolute',
-            'top': '20%',
-            'left': '5%',
-            'width': '60%',
-            'box-shadow': '2px 2px 10px rgba(0, 0, 0, 0.2)',
-            'display': 'block'  # Show modal when clicked
-        }
-    
-    return {'display': 'none'}
 
 server = app.server
 
+
+@server.before_request
+def start_live_ingestion():
+    # Not at import: under gunicorn --preload a thread started there would only run in the master
+    if live_ingestor is not None:
+        live_ingestor.start()
+
+
+@server.before_request
+def check_rules_file():
+    try:
+        new_taxonomy = taxonomy_file.check(time.monotonic())
+    except (ValueError, OSError) as e:
+        # Keep serving the current taxonomy; the next save of rules.txt is picked up as usual
+        server.logger.error("Ignoring %s, it could not be loaded: %s", taxonomy_file.path, e)
+        return
+    if new_taxonomy is not None:
+        reload_taxonomy(new_taxonomy)
+
+
+@server.route('/cache-stats')
+def cache_stats():
+    return callback_cache.stats()
+
+
+if metrics.enabled:
+    server.after_request(metrics.after_request)
+
+
+_dataset_bytes = {}
+
+
+@server.route('/metrics')
+def prometheus_metrics():
+    snapshot = state
+    version = snapshot.version
+    if version not in _dataset_bytes:  # deep memory_usage walks every string, so once per data version
+        _dataset_bytes.clear()
+        _dataset_bytes[version] = int(snapshot.df.memory_usage(deep=True).sum())
+    cache = callback_cache.stats()
+    gauges = [
+        ('eaa_dataset_rows', 'Findings loaded in this worker.', len(snapshot.df)),
+        ('eaa_dataset_memory_bytes', 'In-memory size of the loaded frame.', _dataset_bytes[version]),
+        ('eaa_callback_cache_entries', 'Entries in the callback result cache.', cache['size']),
+    ]
+    body = metrics.render(gauges)
+    return body, 200, {'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'}
+
+
+@server.route('/components')
+def components():
+    # Component-level issues, most repeated first; accepts the dashboard filters as query parameters,
+    # e.g. /components?Test%20Title=Home&Impact=critical
+    selection = {dim: request.args.getlist(dim) for dim in FilterEngine.DIMENSIONS if dim in request.args}
+    snapshot = state
+    frame = snapshot.clusters.frame(snapshot.df, snapshot.filter_engine.rows(selection) if selection else None).head(1000)
+    frame['Pattern'] = snapshot.details.rows(frame.pop('row'), ['Selector'])['Selector'].map(selector_pattern, na_action='ignore').to_numpy()
+    frame = frame.astype(object)
+    return frame.where(frame.notna(), None).to_dict('records')
+
+
+@server.route('/unmapped-rules')
+def unmapped_rules():
+    snapshot = state
+    return snapshot.taxonomy.unmapped(snapshot.df['Rule ID']).to_dict('records')
+
 if __name__ == "__main__":
     app.run(debug=True)
@@ -0,0 +1,496 @@
+import copy
+import re
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+
+class CountCube:
+    """Dense Test Title x Rule Category x Impact count array, built once per dataset.
+
+    The last slot of the impact axis holds rows with no Impact so that row totals
+    still match len(df) while the chart (which groupby would have dropped them from)
+    only reads the real impact levels.
+    """
+
+    def __init__(self, df, impact_order, titles=None, categories=None):
+        self.impact_order = list(impact_order)
+        self.titles = list(pd.unique(df['Test Title'])) if titles is None else list(titles)
+        self.categories = sorted(pd.unique(df['Rule Category'])) if categories is None else list(categories)
+        self.title_index = {t: i for i, t in enumerate(self.titles)}
+        self.category_index = {c: i for i, c in enumerate(self.categories)}
+        self.counts = self._count(df)
+        self._update_totals()
+
+    def _count(self, df):
+        title_codes = pd.Index(self.titles).get_indexer(np.asarray(df['Test Title'], dtype=object))
+        category_codes = pd.Index(self.categories).get_indexer(np.asarray(df['Rule Category'], dtype=object))
+        impact_codes = pd.Categorical(df['Impact'], categories=self.impact_order).codes.astype(np.int64)
+        impact_codes[impact_codes < 0] = len(self.impact_order)
+
+        shape = (len(self.titles), len(self.categories), len(self.impact_order) + 1)
+        flat = (title_codes * shape[1] + category_codes) * shape[2] + impact_codes
+        return np.bincount(flat, minlength=int(np.prod(shape))).reshape(shape)
+
+    def _update_totals(self):
+        self.all_titles = self.counts.sum(axis=0)
+        self.total = int(self.counts.sum())
+
+    def extended(self, rows):
+        """Return a new cube with the counts of ``rows`` added, growing the axes as needed."""
+        titles = self.titles + [t for t in pd.unique(rows['Test Title']) if t not in self.title_index]
+        categories = sorted(set(self.categories).union(pd.unique(rows['Rule Category'])))
+        cube = CountCube(rows, self.impact_order, titles, categories)
+        old_categories = [cube.category_index[c] for c in self.categories]
+        cube.counts[np.ix_(np.arange(len(self.titles)), old_categories)] += self.counts
+        cube._update_totals()
+        return cube
+
+    def _title_slice(self, titles):
+        if titles is None:
+            return self.all_titles
+        idx = [self.title_index[t] for t in dict.fromkeys(titles) if t in self.title_index]
+        return self.counts[idx].sum(axis=0)
+
+    def row_count(self, titles=None):
+        return int(self._title_slice(titles).sum())
+
+    def category_count(self, categories, titles=None):
+        idx = [self.category_index[c] for c in dict.fromkeys(categories) if c in self.category_index]
+        return int(self._title_slice(titles)[idx].sum())
+
+    def category_impact_frame(self, titles=None):
+        # Same shape as filtered_df.groupby(['Rule Category', 'Impact']).size().reset_index(name='count')
+        matrix = self._title_slice(titles)[:, :len(self.impact_order)]
+        present = np.flatnonzero(matrix.sum(axis=1))
+        return pd.DataFrame({
+            'Rule Category': np.repeat(np.asarray(self.categories, dtype=object)[present], len(self.impact_order)),
+            'Impact': pd.Categorical(np.tile(self.impact_order, len(present)),
+                                     categories=self.impact_order, ordered=True),
+            'count': matrix[present].ravel(),
+        })
+
+
+class TrendRollup:
+    """Finding counts per Created At bucket, Test Title, Rule Category and Impact.
+
+    Timestamps are parsed once into a day-level table; week (starting Monday) and month
+    tables are rolled up from it, so filtering or switching granularity never touches the
+    raw frame. The parsed day and Impact code of every row are kept as small arrays so
+    the cross-filter engine's row selections can be bucketed without re-parsing.
+    """
+
+    KEYS = ['Test Title', 'Rule Category', 'Impact']
+    GRANULARITIES = ['day', 'week', 'month']
+
+    def __init__(self, df, impact_order):
+        self.impact_order = list(impact_order)
+        self.row_days, self.row_impacts = self._row_codes(df)
+        self.tables = self._rollup(self._day_counts(df, self.row_days))
+
+    def _row_codes(self, df):
+        created = pd.to_datetime(df['Created At'], utc=True, errors='coerce').dt.tz_localize(None)
+        days = created.to_numpy(dtype='datetime64[ns]').astype('datetime64[D]')
+        impacts = pd.Categorical(df['Impact'], categories=self.impact_order).codes
+        return days, impacts
+
+    def _day_counts(self, df, days):
+        frame = pd.DataFrame({'period': days.astype('datetime64[ns]'), **{k: df[k].to_numpy() for k in self.KEYS}})
+        return self._sum(frame.dropna(subset=['period']).assign(count=1))
+
+    def _sum(self, frame):
+        frame = frame.astype({'Test Title': object, 'Rule Category': object})
+        frame['Impact'] = pd.Categorical(frame['Impact'], categories=self.impact_order, ordered=True)
+        return frame.groupby(['period'] + self.KEYS, observed=True)['count'].sum().reset_index()
+
+    def _rollup(self, day):
+        return {
+            'day': day,
+            'week': self._sum(day.assign(period=day['period'] - pd.to_timedelta(day['period'].dt.dayofweek, unit='D'))),
+            'month': self._sum(day.assign(period=day['period'].dt.to_period('M').dt.to_timestamp())),
+        }
+
+    def extended(self, rows):
+        trend = copy.copy(self)
+        days, impacts = self._row_codes(rows)
+        trend.row_days = np.concatenate([self.row_days, days])
+        trend.row_impacts = np.concatenate([self.row_impacts, impacts])
+        day = pd.concat([self.tables['day'], self._day_counts(rows, days)], ignore_index=True)
+        trend.tables = self._rollup(self._sum(day))
+        return trend
+
+    def series(self, granularity, titles=None, categories=None):
+        """Counts per period and Impact for the given filters (None means no filter)."""
+        table = self.tables[granularity]
+        mask = np.ones(len(table), dtype=bool)
+        if titles is not None:
+            mask &= table['Test Title'].isin(titles).to_numpy()
+        if categories is not None:
+            mask &= table['Rule Category'].isin(categories).to_numpy()
+        return table[mask].groupby(['period', 'Impact'], observed=False)['count'].sum().reset_index()
+
+    def series_for_rows(self, granularity, rows):
+        """Same as ``series`` for an arbitrary set of row positions, e.g. from FilterEngine.rows."""
+        days, impacts = self.row_days[rows], self.row_impacts[rows]
+        keep = ~np.isnat(days) & (impacts >= 0)
+        days, impacts = days[keep], impacts[keep]
+        if granularity == 'week':
+            # 1970-01-01 was a Thursday, so (days + 3) % 7 is the weekday counted from Monday
+            days = days - (days.astype(np.int64) + 3) % 7
+        elif granularity == 'month':
+            days = days.astype('datetime64[M]').astype('datetime64[D]')
+        frame = pd.DataFrame({
+            'period': days.astype('datetime64[ns]'),
+            'Impact': pd.Categorical.from_codes(impacts, categories=self.impact_order, ordered=True),
+            'count': 1,
+        })
+        return frame.groupby(['period', 'Impact'], observed=False)['count'].sum().reset_index()
+
+
+class PostingsIndex:
+    """Inverted index from a value to the sorted row positions holding it.
+
+    With ``sep`` each cell is split into several values first, e.g. the comma-joined Tags.
+    """
+
+    def __init__(self, values=None, sep=None, offset=0):
+        self.postings = {}
+        if values is not None:
+            self._add(values, sep, offset)
+
+    def _add(self, values, sep, offset):
+        values = pd.Series(np.asarray(values, dtype=object))
+        if sep is not None:
+            values = values.str.split(sep).explode().str.strip()
+        values = values[values.notna() & (values != '')]
+        codes, uniques = pd.factorize(values)
+        positions = values.index.to_numpy(dtype=np.int64) + offset
+        order = np.argsort(codes, kind='stable')
+        bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+        for i, value in enumerate(uniques):
+            new = positions[order[bounds[i]:bounds[i + 1]]]
+            existing = self.postings.get(value)
+            self.postings[value] = new if existing is None else np.concatenate([existing, new])
+
+    def extended(self, values, offset, sep=None):
+        """Return a new index with ``values`` added as rows ``offset``, ``offset + 1``, ..."""
+        index = PostingsIndex()
+        index.postings = dict(self.postings)
+        index._add(values, sep, offset)
+        return index
+
+    def keys(self):
+        return self.postings.keys()
+
+    def lookup(self, values):
+        """Sorted positions of rows holding any of ``values``."""
+        found = [self.postings[v] for v in dict.fromkeys(values) if v in self.postings]
+        if not found:
+            return np.empty(0, dtype=np.int64)
+        return found[0] if len(found) == 1 else np.unique(np.concatenate(found))
+
+
+class FilterEngine:
+    """Cross-filter over the filterable dimensions using packed row bitmaps.
+
+    A selection maps dimensions to lists of values; values of one dimension are OR-ed and
+    dimensions are AND-ed. Each value's bitmap is packed from its postings on first use and
+    kept in a bounded LRU, so high-cardinality dimensions do not hold a bitmap per value.
+    """
+
+    DIMENSIONS = ['Test Title', 'Rule Category', 'Impact', 'Brand', 'Country', 'Found By', 'Tags']
+    SEPARATORS = {'Tags': ','}
+
+    def __init__(self, df=None, max_bitmaps=1024):
+        self.max_bitmaps = max_bitmaps
+        self.size = 0
+        self.postings = {}
+        self._bitmaps = OrderedDict()
+        self._lock = threading.Lock()
+        if df is not None:
+            self.size = len(df)
+            self.postings = {dim: PostingsIndex(df[dim], sep=self.SEPARATORS.get(dim))
+                             for dim in self.DIMENSIONS if dim in df.columns}
+
+    def extended(self, rows, offset):
+        engine = FilterEngine(max_bitmaps=self.max_bitmaps)
+        engine.size = offset + len(rows)
+        engine.postings = {dim: index.extended(rows[dim], offset, sep=self.SEPARATORS.get(dim)) if dim in rows.columns else index
+                           for dim, index in self.postings.items()}
+        return engine
+
+    def values(self, dim):
+        return sorted(self.postings[dim].keys()) if dim in self.postings else []
+
+    def bitmap(self, dim, value):
+        key = (dim, value)
+        with self._lock:
+            if key in self._bitmaps:
+                self._bitmaps.move_to_end(key)
+                return self._bitmaps[key]
+        bits = np.zeros(self.size, dtype=bool)
+        bits[self.postings[dim].lookup([value])] = True
+        packed = np.packbits(bits)
+        with self._lock:
+            self._bitmaps[key] = packed
+            while len(self._bitmaps) > self.max_bitmaps:
+                self._bitmaps.popitem(last=False)
+        return packed
+
+    def mask(self, selection):
+        """Packed bitmap of rows matching ``selection``, or None when nothing is filtered."""
+        result = None
+        for dim, values in active_filters(selection).items():
+            if dim not in self.postings:
+                continue
+            bitmaps = [self.bitmap(dim, v) for v in values]
+            dim_mask = np.bitwise_or.reduce(bitmaps) if bitmaps else np.zeros((self.size + 7) // 8, dtype=np.uint8)
+            result = dim_mask if result is None else result & dim_mask
+        return result
+
+    def rows(self, selection):
+        mask = self.mask(selection)
+        if mask is None:
+            return np.arange(self.size)
+        return np.flatnonzero(np.unpackbits(mask, count=self.size))
+
+
+class ComponentClusters:
+    """Findings grouped into component-level issues: one cluster per Test Title, Rule ID and
+    selector pattern (the Component hash of the Selector with positional indices stripped).
+
+    ``ids`` maps every row to its cluster. A cluster is counted once, under the Rule Category
+    and Impact of its first row; ``representatives`` holds those rows for the whole dataset.
+    """
+
+    KEYS = ['Test Title', 'Rule ID', 'Component']
+
+    def __init__(self, df=None):
+        self.keys = pd.Index(np.empty(0, dtype=np.uint64))
+        self.ids = np.empty(0, dtype=np.int64)
+        self.representatives = np.empty(0, dtype=np.int64)
+        self.sizes = np.empty(0, dtype=np.int64)
+        if df is not None:
+            self._add(df, 0)
+
+    def _add(self, df, offset):
+        hashes = pd.util.hash_pandas_object(df[self.KEYS], index=False).to_numpy()
+        ids = self.keys.get_indexer(hashes)
+        new = ids < 0
+        new_keys, first = np.unique(hashes[new], return_index=True)
+        first = np.flatnonzero(new)[first]
+        order = np.argsort(first)  # new clusters are numbered in row order
+        new_keys, first = new_keys[order], first[order]
+        ids[new] = len(self.keys) + pd.Index(new_keys).get_indexer(hashes[new])
+        self.keys = self.keys.append(pd.Index(new_keys))
+        self.ids = np.concatenate([self.ids, ids])
+        self.representatives = np.concatenate([self.representatives, first + offset])
+        self.sizes = np.bincount(self.ids, minlength=len(self.keys))
+
+    def extended(self, rows, offset):
+        clusters = copy.copy(self)
+        clusters._add(rows, offset)
+        return clusters
+
+    def __len__(self):
+        return len(self.keys)
+
+    def first_rows(self, rows):
+        """The first of ``rows`` (sorted positions) in each cluster they touch."""
+        _, first = np.unique(self.ids[rows], return_index=True)
+        return np.sort(np.asarray(rows)[first])
+
+    def frame(self, df, rows=None):
+        """One row per cluster touched by ``rows``: Test Title, Rule ID, the cluster's size and a sample row."""
+        rows = self.representatives if rows is None else self.first_rows(rows)
+        frame = df.iloc[rows][['Test Title', 'Rule Category', 'Rule ID', 'Impact']].reset_index(drop=True)
+        frame['occurrences'] = self.sizes[self.ids[rows]]
+        frame['row'] = rows
+        return frame.sort_values('occurrences', ascending=False, kind='stable', ignore_index=True)
+
+
+def _member(keys, other):
+    # Sorted-array membership on the fixed-width keys; 0 marks a finding without an identifier
+    other = np.unique(other[other != 0])
+    pos = np.searchsorted(other, keys).clip(max=max(len(other) - 1, 0))
+    return (keys != 0) & (other[pos] == keys) if len(other) else np.zeros(len(keys), dtype=bool)
+
+
+class AuditDiff:
+    """The current audit matched against a baseline audit on the hashed Finding Key.
+
+    Current rows are new (key absent from the baseline) or persisting. Baseline rows whose key
+    is gone are fixed; they are kept with their own FilterEngine so every filtered view can
+    count them next to the current rows.
+    """
+
+    STATUSES = ['new', 'fixed', 'persisting']
+
+    def __init__(self, current_keys, baseline):
+        current_keys = np.asarray(current_keys, dtype=np.uint64)
+        baseline_keys = baseline['Finding Key'].to_numpy(dtype=np.uint64)
+        self.is_new = ~_member(current_keys, baseline_keys)
+        self.fixed = baseline[~_member(baseline_keys, current_keys)].reset_index(drop=True)
+        self.fixed_engine = FilterEngine(self.fixed)
+
+    def counts(self, current, rows, filters, by):
+        """new / fixed / persisting columns per ``by`` group, for current ``rows`` and the fixed rows matching ``filters``."""
+        fixed_rows = self.fixed_engine.rows(filters)
+        frame = pd.concat([
+            current.iloc[rows][by].assign(Status=np.where(self.is_new[rows], 'new', 'persisting')),
+            self.fixed.iloc[fixed_rows][by].assign(Status='fixed'),
+        ], ignore_index=True)
+        # Labels sort alphabetically like the other views; Impact keeps its severity order
+        frame = frame.astype({c: object for c in by if c != 'Impact'})
+        table = frame.groupby(by + ['Status'], observed=True).size().unstack('Status', fill_value=0)
+        return table.reindex(columns=self.STATUSES, fill_value=0).rename_axis(columns=None).reset_index()
+
+
+def active_filters(selection, exclude=()):
+    """Drop unfiltered dimensions (no values, or "All") from a selection dict."""
+    return {dim: list(values) for dim, values in (selection or {}).items()
+            if values and 'All' not in values and dim not in exclude}
+
+
+RULE_KEYS = ['Rule Category', 'Rule ID', 'Impact']
+
+
+def rule_impact_counts(df):
+    """Non-zero finding counts per Rule Category, Rule ID and Impact (one row per distinct rule/impact)."""
+    counts = df.groupby(RULE_KEYS, observed=True).size().reset_index(name='count')
+    return _sort_rule_counts(counts[counts['count'] > 0])
+
+
+def merge_rule_counts(counts, rows):
+    merged = pd.concat([counts, rule_impact_counts(rows)], ignore_index=True)
+    return _sort_rule_counts(merged.groupby(RULE_KEYS, observed=True)['count'].sum().reset_index())
+
+
+def _sort_rule_counts(counts):
+    counts = counts.astype({'Rule Category': object, 'Rule ID': object})
+    return counts.sort_values(['Rule ID', 'Impact']).reset_index(drop=True)
+
+
+# DataTable filter_query syntax: "{column} op value" clauses joined by && / and / || / or, where op is a
+# relational operator optionally prefixed with i (case-insensitive) or s (case-sensitive, the default),
+# or "is <type>" for the unary checks below. Parentheses and "!" negation are not supported
+RELATIONAL_OPERATORS = {
+    '=': 'eq', 'eq': 'eq', '!=': 'ne', 'ne': 'ne', '<': 'lt', 'lt': 'lt', '<=': 'le', 'le': 'le',
+    '>': 'gt', 'gt': 'gt', '>=': 'ge', 'ge': 'ge', 'contains': 'contains', 'datestartswith': 'datestartswith',
+}
+UNARY_OPERATORS = ['blank', 'nil', 'num', 'str', 'even', 'odd']
+FILTER_TOKEN = re.compile(r"""\s*(\{[^}]+\}|"(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*'|`(?:\\.|[^`\\])*`|[^\s{}"'`]+)""")
+
+
+def _parse_relational(op):
+    case = op[0] if op[:1] in ('i', 's') and op[1:] in RELATIONAL_OPERATORS else ''
+    name = RELATIONAL_OPERATORS.get(op[len(case):])
+    if name is None:
+        raise ValueError(f"unsupported filter operator {op!r}")
+    return name, case != 'i'
+
+
+def _parse_filter_query(filter_query):
+    """filter_query -> list of OR-ed groups of AND-ed (column, op, text, number, case_sensitive) clauses."""
+    tokens, pos = [], 0
+    while pos < len(filter_query.rstrip()):
+        match = FILTER_TOKEN.match(filter_query, pos)
+        if not match:
+            raise ValueError(f"cannot parse filter at {filter_query[pos:]!r}")
+        tokens.append(match[1])
+        pos = match.end()
+
+    groups, clauses = [], []
+    tokens.reverse()
+    while tokens:
+        field = tokens.pop()
+        if not (field.startswith('{') and tokens):
+            raise ValueError(f"expected a {{column}} at {field!r}")
+        op = tokens.pop()
+        if op == 'is':
+            kind = tokens.pop() if tokens else None
+            if kind not in UNARY_OPERATORS:
+                raise ValueError(f"unsupported filter check 'is {kind}'")
+            clauses.append((field[1:-1], kind, None, None, True))
+        else:
+            name, case_sensitive = _parse_relational(op)
+            if not tokens:
+                raise ValueError(f"missing value after {op!r}")
+            text, number = tokens.pop(), None
+            if text[:1] in ('"', "'", '`'):
+                text = text[1:-1].replace('\\' + text[0], text[0])
+            else:
+                try:
+                    number = float(text)
+                except ValueError:
+                    pass
+            clauses.append((field[1:-1], name, text, number, case_sensitive))
+        if tokens:
+            joiner = tokens.pop()
+            if joiner in ('||', 'or'):
+                groups.append(clauses)
+                clauses = []
+            elif joiner not in ('&&', 'and') or not tokens:
+                raise ValueError(f"unexpected {joiner!r} in filter")
+    groups.append(clauses)
+    return groups
+
+
+def _clause_mask(frame, name, op, text, number, case_sensitive):
+    if name not in frame.columns:
+        raise ValueError(f"unknown filter column {name!r}")
+    col = frame[name]
+    present = col.notna().to_numpy()
+    numeric = pd.api.types.is_numeric_dtype(col) and not isinstance(col.dtype, pd.CategoricalDtype)
+    if op in UNARY_OPERATORS:
+        if op == 'nil':
+            return ~present
+        if op == 'blank':
+            return ~present | (col.astype(str).str.strip() == '').to_numpy()
+        if op == 'num':
+            return present & numeric
+        if op == 'str':
+            return present & (not numeric)
+        if not numeric:
+            return np.zeros(len(col), dtype=bool)
+        remainder = (col.fillna(0.5) % 2).to_numpy()
+        return present & (remainder == (0 if op == 'even' else 1))
+    if numeric and number is not None and op not in ('contains', 'datestartswith'):
+        values, target = col, number
+    else:
+        # Text comparison against the value as typed, so {count} contains 5 does not look for "5.0"
+        values, target = col.astype(str), text
+        if not case_sensitive:
+            values, target = values.str.lower(), target.lower()
+    if op == 'contains':
+        return present & values.str.contains(target, regex=False).to_numpy()
+    if op == 'datestartswith':
+        return present & values.str.startswith(target).to_numpy()
+    result = {'eq': values == target, 'ne': values != target, 'lt': values < target, 'le': values <= target,
+              'gt': values > target, 'ge': values >= target}[op].to_numpy()
+    return result if op == 'ne' else present & result
+
+
+def query_table(frame, sort_by=None, filter_query='', page_current=0, page_size=25):
+    """Server-side filter, sort and page for a DataTable in custom mode; returns (records, page_count)."""
+    if filter_query and filter_query.strip():
+        try:
+            mask = np.zeros(len(frame), dtype=bool)
+            for clauses in _parse_filter_query(filter_query):
+                group = np.ones(len(frame), dtype=bool)
+                for clause in clauses:
+                    group &= _clause_mask(frame, *clause)
+                mask |= group
+        except ValueError:
+            # A filter shown as applied must not return unfiltered rows
+            mask = np.zeros(len(frame), dtype=bool)
+        frame = frame[mask]
+    if sort_by:
+        frame = frame.sort_values([s['column_id'] for s in sort_by],
+                                  ascending=[s['direction'] == 'asc' for s in sort_by], kind='stable')
+    page_count = max(1, -(-len(frame) // page_size))
+    page_current = min(page_current, page_count - 1)
+    page = frame.iloc[page_current * page_size:(page_current + 1) * page_size]
+    return page.to_dict('records'), page_count
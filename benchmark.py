@@ -0,0 +1,194 @@
+"""Reproducible dashboard benchmark on synthetic exports.
+
+    python benchmark.py --rows 100000 --rows 1000000 -o benchmarks.jsonl
+
+Each size gets a synthetic export (generated once into --data-dir with a fixed seed).
+A fresh interpreter then imports EAA twice against it, first without a .eaa_cache entry
+(cold load) and then with one (warm load), and times every server callback over a fixed
+set of selections with the callback result cache turned off. One JSON record per size
+is appended to the output file, and the run is compared with the previous record for
+the same size.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+CALLBACKS = ['update_chart', 'display_selected_categories', 'update_trend']
+
+
+def fixed_selections(EAA):
+    """Selections derived from the data itself, so the same seed always gives the same set."""
+    df = EAA.state.df
+    title = df['Test Title'].value_counts().index[0]
+    category = df['Rule Category'].value_counts().index[0]
+    brand = df['Brand'].value_counts().index[0]
+    country = df.loc[df['Brand'] == brand, 'Country'].value_counts().index[0]
+    tags = EAA.state.criterion_tags()
+    criterion = max(tags, key=lambda t: len(EAA.state.filter_engine.rows({'Tags': [t]}))) if tags else None
+    selections = {
+        'all': {'Test Title': ['All'], 'Rule Category': [category]},
+        'title': {'Test Title': [title], 'Rule Category': [category]},
+        'impact': {'Impact': ['critical'], 'Rule Category': [category]},
+        'brand-country': {'Brand': [brand], 'Country': [country], 'Rule Category': [category]},
+    }
+    if criterion:
+        selections['criterion'] = {'Tags': [criterion], 'Rule Category': [category]}
+    return selections
+
+
+def run_worker(repeat):
+    """Runs inside the benchmark subprocess: import EAA, time the callbacks, print JSON."""
+    import dash  # noqa: F401  framework imports are not part of the load time
+    import pandas  # noqa: F401
+    import plotly.express  # noqa: F401
+
+    started = time.perf_counter()
+    import EAA
+    load_seconds = time.perf_counter() - started
+    from metrics import peak_rss, process_rss
+    rss_after_load = process_rss()
+
+    calls = {
+        'update_chart': lambda s: EAA.update_chart(s),
+        'display_selected_categories': lambda s: EAA.display_selected_categories(s),
+        'update_trend': lambda s: EAA.update_trend('week', s),
+    }
+    callbacks = {}
+    for name, call in calls.items():
+        callbacks[name] = {}
+        for label, selection in fixed_selections(EAA).items():
+            samples = []
+            for _ in range(repeat + 1):
+                t = time.perf_counter()
+                call(selection)
+                samples.append((time.perf_counter() - t) * 1000)
+            # The first call also builds filter bitmaps; report it apart from the steady state
+            steady = np.array(samples[1:])
+            callbacks[name][label] = {
+                'first_ms': round(samples[0], 3),
+                'p50_ms': round(float(np.percentile(steady, 50)), 3),
+                'p99_ms': round(float(np.percentile(steady, 99)), 3),
+            }
+    print(json.dumps({
+        'load_seconds': round(load_seconds, 4),
+        'dataset_rows': len(EAA.state.df),
+        'dataset_memory_bytes': int(EAA.state.df.memory_usage(deep=True).sum()),
+        'rss_after_load_bytes': rss_after_load,
+        'peak_rss_bytes': peak_rss(),
+        'callbacks': callbacks,
+    }))
+
+
+def measure(data_path, work_dir, repeat, cold):
+    if cold:
+        shutil.rmtree(os.path.join(work_dir, '.eaa_cache'), ignore_errors=True)
+    env = {**os.environ, 'EAA_INPUT': data_path, 'EAA_RULES': os.environ.get('EAA_RULES', os.path.join(HERE, 'rules.txt')),
+           'EAA_CALLBACK_CACHE_SIZE': '0'}
+    for name in ('EAA_WATCH', 'EAA_CALLBACK_CACHE', 'EAA_METRICS'):
+        env.pop(name, None)
+    out = subprocess.run([sys.executable, os.path.join(HERE, 'benchmark.py'), '--worker', '--repeat', str(repeat)],
+                         cwd=work_dir, env=env, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=HERE, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def benchmark(rows, data_dir, repeat, seed):
+    from synthetic import generate_export
+
+    os.makedirs(data_dir, exist_ok=True)
+    data_path = os.path.abspath(os.path.join(data_dir, f'synthetic-{rows}-seed{seed}.csv'))
+    if not os.path.exists(data_path):
+        print(f"generating {rows} rows -> {data_path}")
+        generate_export(data_path + '.tmp', rows, os.path.join(HERE, 'input.csv'), seed=seed)
+        os.replace(data_path + '.tmp', data_path)
+
+    cold = measure(data_path, data_dir, repeat, cold=True)
+    warm = measure(data_path, data_dir, repeat, cold=False)
+    import numpy
+    import pandas
+    return {
+        'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'pandas': pandas.__version__,
+        'numpy': numpy.__version__,
+        'machine': platform.machine(),
+        'rows': rows,
+        'seed': seed,
+        'file_bytes': os.path.getsize(data_path),
+        'cold_load_seconds': cold['load_seconds'],
+        'warm_load_seconds': warm['load_seconds'],
+        'dataset_memory_bytes': cold['dataset_memory_bytes'],
+        'rss_after_load_bytes': cold['rss_after_load_bytes'],
+        'peak_rss_bytes': cold['peak_rss_bytes'],
+        # Warm process: same code path, without the one-off cost of parsing the CSV
+        'callbacks': warm['callbacks'],
+    }
+
+
+def previous_record(path, rows):
+    if not os.path.exists(path):
+        return None
+    previous = None
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                if record.get('rows') == rows:
+                    previous = record
+    return previous
+
+
+def compare(record, previous):
+    def change(new, old):
+        return f"{new:10.3f} ({(new / old - 1) * 100:+6.1f}%)" if previous and old else f"{new:10.3f}"
+
+    old = previous or {}
+    print(f"\n{record['rows']} rows" + (f"  vs {previous['commit']} at {previous['timestamp']}" if previous else ''))
+    print(f"  cold load s     {change(record['cold_load_seconds'], old.get('cold_load_seconds'))}")
+    print(f"  warm load s     {change(record['warm_load_seconds'], old.get('warm_load_seconds'))}")
+    if record['peak_rss_bytes'] is not None:
+        print(f"  peak RSS MB     {change(record['peak_rss_bytes'] / 2 ** 20, (old.get('peak_rss_bytes') or 0) / 2 ** 20)}")
+    for name, selections in record['callbacks'].items():
+        for label, stats in selections.items():
+            before = old.get('callbacks', {}).get(name, {}).get(label, {})
+            print(f"  {name:28} {label:14} p50 {change(stats['p50_ms'], before.get('p50_ms'))}"
+                  f"  p99 {change(stats['p99_ms'], before.get('p99_ms'))}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark load time, memory and callback latency on synthetic exports")
+    parser.add_argument('--rows', type=int, action='append', help="export size (repeatable, default 100000)")
+    parser.add_argument('-o', '--output', default='benchmarks.jsonl', help="JSON-lines file the results are appended to")
+    parser.add_argument('--data-dir', default='.eaa_bench', help="where synthetic exports and their load cache live")
+    parser.add_argument('--repeat', type=int, default=20, help="timed calls per callback and selection")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.repeat)
+        sys.exit()
+
+    for rows in args.rows or [100_000]:
+        record = benchmark(rows, args.data_dir, args.repeat, args.seed)
+        previous = previous_record(args.output, rows)
+        with open(args.output, 'a') as f:
+            f.write(json.dumps(record) + '\n')
+        compare(record, previous)
@@ -0,0 +1,132 @@
+import hashlib
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from contextlib import contextmanager
+
+
+def normalize_selection(values, all_value='All'):
+    """Cache key for a multi-select value: sorted, deduplicated, with "All" (or nothing) collapsed."""
+    if not values or all_value in values:
+        return (all_value,)
+    return tuple(sorted(set(values)))
+
+
+class MemoryBackend:
+    """Per-process LRU."""
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._items:
+                return None
+            self._items.move_to_end(key)
+            return self._items[key]
+
+    def set(self, key, value):
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def __len__(self):
+        return len(self._items)
+
+
+class SQLiteBackend:
+    """LRU stored in a SQLite file so every gunicorn worker on the host shares the results."""
+
+    def __init__(self, path, maxsize=1024):
+        self.path = path
+        self.maxsize = maxsize
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value BLOB, last_used REAL)')
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, key):
+        with self._connect() as conn:
+            row = conn.execute('SELECT value FROM results WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                return None
+            conn.execute('UPDATE results SET last_used = ? WHERE key = ?', (time.time(), key))
+        return pickle.loads(row[0])
+
+    def set(self, key, value):
+        with self._connect() as conn:
+            conn.execute('INSERT OR REPLACE INTO results VALUES (?, ?, ?)',
+                         (key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL), time.time()))
+            conn.execute('DELETE FROM results WHERE key NOT IN '
+                         '(SELECT key FROM results ORDER BY last_used DESC LIMIT ?)', (self.maxsize,))
+
+    def clear(self):
+        with self._connect() as conn:
+            conn.execute('DELETE FROM results')
+
+    def __len__(self):
+        with self._connect() as conn:
+            return conn.execute('SELECT COUNT(*) FROM results').fetchone()[0]
+
+
+class CallbackCache:
+    """Memoizes callback results per (callback, dataset version, normalized selection).
+
+    Entries of an older dataset version are never returned; the in-process backend is
+    cleared on a version change, the shared one lets them age out of its LRU since other
+    workers may still be serving that version.
+    """
+
+    def __init__(self, backend=None, version=None, on_lookup=None):
+        self.backend = backend if backend is not None else MemoryBackend()
+        self.version = version
+        self.on_lookup = on_lookup  # called with (name, hit) after every lookup
+        self.hits = defaultdict(int)
+        self.misses = defaultdict(int)
+
+    def set_version(self, version):
+        if version != self.version and isinstance(self.backend, MemoryBackend):
+            self.backend.clear()
+        self.version = version
+
+    def get_or_compute(self, name, key, compute, version=None):
+        # ``version`` is the dataset version ``compute`` reads, when that may already be behind self.version
+        version = self.version if version is None else version
+        cache_key = hashlib.sha1(repr((name, version, key)).encode()).hexdigest()
+        value = self.backend.get(cache_key)
+        if self.on_lookup is not None:
+            self.on_lookup(name, value is not None)
+        if value is not None:
+            self.hits[name] += 1
+            return value
+        self.misses[name] += 1
+        value = compute()
+        self.backend.set(cache_key, value)
+        return value
+
+    def stats(self):
+        names = sorted(set(self.hits) | set(self.misses))
+        return {
+            'version': self.version,
+            'size': len(self.backend),
+            'maxsize': self.backend.maxsize,
+            'callbacks': {n: {'hits': self.hits[n], 'misses': self.misses[n]} for n in names},
+        }
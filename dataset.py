@@ -0,0 +1,253 @@
+import glob
+import hashlib
+import json
+import logging
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+from details import DetailStore
+
+try:
+    import pyarrow.feather as feather
+except ImportError:  # pyarrow is optional, fall back to pickle
+    feather = None
+
+logger = logging.getLogger(__name__)
+
+CACHE_VERSION = 5
+CACHE_DIR = '.eaa_cache'
+
+# Columns the callbacks read, kept resident; everything else goes to the on-disk DetailStore
+CORE_COLUMNS = [
+    'Impact', 'Test Title', 'Rule ID', 'Rule Category', 'Tags', 'Found By', 'Created At', 'Country', 'Brand',
+    'Component', 'Finding Key', 'Unique ID',
+]
+
+# Text columns repeated across many findings; stored as categoricals in the cache
+CATEGORICAL_COLUMNS = [
+    'Test Title', 'Test URL', 'Help URL', 'Rule ID', 'Description', 'Help', 'Manual', 'Needs Review',
+    'IGT', 'Summary', 'Tags', 'Found By', 'Country', 'Brand', 'Rule Category',
+]
+
+# Positional parts of a CSS selector; what is left is the component's structural path
+SELECTOR_POSITION = re.compile(r':(?:nth-(?:last-)?(?:of-type|child))\([^)]*\)|:(?:first|last|only)-(?:of-type|child)')
+
+
+def selector_pattern(selector):
+    return SELECTOR_POSITION.sub('', selector)
+
+
+def component_hashes(selectors):
+    """uint64 hash of each selector's structural path, normalizing every distinct selector once."""
+    selectors = selectors.astype('category')
+    patterns = [selector_pattern(s) for s in selectors.cat.categories] + ['']
+    hashes = pd.util.hash_array(np.asarray(patterns, dtype=object))
+    return pd.Series(hashes[selectors.cat.codes.to_numpy()], index=selectors.index, name='Component')  # NaN -> ''
+
+
+def finding_keys(identifiers):
+    """uint64 hash of each Unique string identifier, the key findings are matched on across audits (0 if missing)."""
+    present = identifiers.notna().to_numpy()
+    keys = np.zeros(len(identifiers), dtype=np.uint64)
+    keys[present] = pd.util.hash_array(np.asarray(identifiers[present], dtype=object))
+    return pd.Series(keys, index=identifiers.index, name='Finding Key')
+
+
+def clean_frame(df, impact_order, taxonomy):
+    df['Impact'] = pd.Categorical(df['Impact'], categories=impact_order, ordered=True)
+    df['Rule ID'] = df['Rule ID'].astype('category')
+    df['Rule Category'] = taxonomy.classify_column(df['Rule ID'])
+    # Merged exports written before Selector was kept count each rule on a page as one component
+    df['Component'] = component_hashes(df['Selector']) if 'Selector' in df.columns else np.uint64(0)
+    if 'Unique string identifier' in df.columns:
+        df['Finding Key'] = finding_keys(df['Unique string identifier'])
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns and df[col].dtype == object:
+            df[col] = df[col].astype('category')
+    if 'Created At' in df.columns:
+        df['Created At'] = pd.to_datetime(df['Created At'], utc=True, errors='coerce')
+    return df
+
+
+def split_frame(df):
+    """Cleaned frame -> (core frame for the callbacks, detail columns for the DetailStore)."""
+    core = [c for c in CORE_COLUMNS if c in df.columns]
+    return df[core], df.drop(columns=core)
+
+
+def read_source(path):
+    # Streaming ingestion (ingest.stream_exports) can produce Parquet instead of CSV
+    if path.endswith('.parquet'):
+        return pd.read_parquet(path)
+    return pd.read_csv(path)
+
+
+def file_hash(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _settings_key(impact_order):
+    payload = json.dumps([CACHE_VERSION, list(impact_order)])
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _cache_files(base, key):
+    # Named after the cache key, so a rebuild writes new files next to the ones other workers are reading
+    # and the meta file, replaced last, switches new workers over in one step
+    data_path = f'{base}.{key}' + ('.feather' if feather is not None else '.pkl')
+    return data_path, f'{base}.{key}.details.jsonl'
+
+
+def _remove_stale(base, key, keep=()):
+    keep = {os.path.abspath(p) for p in keep}
+    pattern = re.compile(re.escape(base) + r'\.[0-9a-f]{16}-[0-9a-f]{8}\.(feather|pkl|details\.jsonl(\.offsets\.npy)?)')
+    for path in glob.glob(glob.escape(base) + '.*'):
+        if pattern.fullmatch(path) and f'.{key}.' not in path and os.path.abspath(path) not in keep:
+            try:
+                os.remove(path)
+            except OSError:  # still mapped by a running worker on Windows; removed by a later rebuild
+                pass
+
+
+def _write_atomic(path, write):
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    write(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def _write_json(path, data):
+    def write(p):
+        with open(p, 'w') as f:
+            json.dump(data, f)
+    _write_atomic(path, write)
+
+
+def _read_cache(data_path):
+    if data_path.endswith('.feather'):
+        return feather.read_table(data_path, memory_map=True).to_pandas()
+    return pd.read_pickle(data_path)
+
+
+def _read_core(data_path, taxonomy):
+    core = _read_cache(data_path)
+    # Rule Category is not cached, so a rules.txt edit does not invalidate the cache; only the distinct
+    # Rule IDs are classified
+    core.insert(core.columns.get_loc('Rule ID') + 1, 'Rule Category', taxonomy.classify_column(core['Rule ID']))
+    return core
+
+
+def _write_cache(df, data_path):
+    if data_path.endswith('.feather'):
+        # Uncompressed so the file can be memory-mapped on load
+        _write_atomic(data_path, lambda p: df.to_feather(p, compression='uncompressed'))
+    else:
+        _write_atomic(data_path, df.to_pickle)
+
+
+def _write_details(detail, path):
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    DetailStore.write(detail, tmp_path)
+    # Data before index: a store is only opened through an index, so it never sees a partial file
+    os.replace(tmp_path, path)
+    os.replace(tmp_path + '.offsets.npy', path + '.offsets.npy')
+
+
+def load_dataset(path, impact_order, taxonomy, cache_dir=None, use_cache=True, keep=()):
+    """Load the cleaned core frame, the DetailStore of the remaining columns and the source's sha256.
+
+    Both go through the cache, which is keyed on the source's size and mtime; when those change
+    the file is hashed and only re-parsed if its content (or the impact order) actually differs.
+    Rule Category is reclassified with ``taxonomy`` on every load. Without the cache (or when the
+    cache directory cannot be written, e.g. a read-only app directory) the detail columns are
+    kept in memory. A rebuild removes the files of earlier cache keys except those in ``keep``,
+    e.g. an older core file still used as the comparison baseline.
+    """
+    if not use_cache:
+        core, detail = split_frame(clean_frame(read_source(path), impact_order, taxonomy))
+        return core, DetailStore(tail=detail), file_hash(path)
+
+    cache_dir = cache_dir or os.path.join(os.path.dirname(os.path.abspath(path)), CACHE_DIR)
+    base = os.path.join(cache_dir, os.path.basename(path))
+    meta_path = base + '.meta.json'
+    stat = os.stat(path)
+    settings = _settings_key(impact_order)
+
+    meta = None
+    if os.path.exists(meta_path):
+        with open(meta_path) as f:
+            meta = json.load(f)
+        data_path, details_path = _cache_files(base, meta.get('key', ''))
+        if meta.get('settings') != settings or not all(
+                os.path.exists(p) for p in (data_path, details_path, details_path + '.offsets.npy')):
+            meta = None
+
+    if meta is not None:
+        if meta['size'] == stat.st_size and meta['mtime_ns'] == stat.st_mtime_ns:
+            return _read_core(data_path, taxonomy), DetailStore(details_path), meta['sha256']
+        digest = file_hash(path)
+        if meta['sha256'] == digest:
+            meta.update(size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+            try:
+                _write_json(meta_path, meta)
+            except OSError:  # still valid, the next start just hashes the source again
+                pass
+            return _read_core(data_path, taxonomy), DetailStore(details_path), digest
+    else:
+        digest = file_hash(path)
+
+    core, detail = split_frame(clean_frame(read_source(path), impact_order, taxonomy))
+    key = f'{digest[:16]}-{settings[:8]}'
+    data_path, details_path = _cache_files(base, key)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        _write_cache(core.drop(columns='Rule Category'), data_path)
+        _write_details(detail, details_path)
+        meta = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': digest, 'settings': settings, 'key': key}
+        _write_json(meta_path, meta)
+        _remove_stale(base, key, keep)
+    except OSError as e:
+        logger.warning("Dataset cache %s is not writable (%s); loading without it", cache_dir, e)
+        return core, DetailStore(tail=detail), digest
+    return core, DetailStore(details_path), digest
+
+
+def load_snapshot(path, impact_order, taxonomy):
+    """Core frame of another audit and its file's sha256, from an export (through its own cache) or a
+    cached .feather/.pkl core file."""
+    if not path.endswith(('.feather', '.pkl')):
+        df, _, digest = load_dataset(path, impact_order, taxonomy)
+        return df, digest
+    df = _read_cache(path)
+    if 'Finding Key' not in df.columns:
+        raise ValueError(f"{path} was cached before findings were keyed; load its export instead")
+    # Cached core files carry no Rule Category, and older ones may predate the current rules.txt
+    df['Rule Category'] = taxonomy.classify_column(df['Rule ID'])
+    return df, file_hash(path)
+
+
+def append_rows(df, rows):
+    """Concatenate cleaned ``rows`` onto ``df`` keeping categorical columns categorical."""
+    head, tail = df.copy(deep=False), rows.copy(deep=False)
+    for col in df.columns:
+        if col not in rows.columns or not isinstance(df[col].dtype, pd.CategoricalDtype):
+            continue
+        if tail[col].dtype != df[col].dtype:
+            values = pd.Index(np.asarray(tail[col].dropna().unique(), dtype=object))
+            extra = values.difference(df[col].cat.categories, sort=False)
+            dtype = pd.CategoricalDtype(df[col].cat.categories.append(extra), ordered=df[col].cat.ordered)
+            head[col] = df[col].astype(dtype)
+            tail[col] = tail[col].astype(dtype)
+    return pd.concat([head, tail], ignore_index=True)
+
+
+def dataset_version(df, key='Unique ID'):
+    # Order-independent fingerprint of rows by key, identical across workers holding the same rows
+    hashes = pd.util.hash_pandas_object(df[key], index=False).to_numpy()
+    return f'{len(df)}-{int(hashes.sum(dtype=np.uint64)):016x}'
@@ -0,0 +1,74 @@
+import copy
+import json
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+
+class DetailStore:
+    """Heavy per-finding columns (Selector, Source Code, URLs, ...) kept out of the resident frame.
+
+    Rows live in a JSON-lines file with one record per finding, addressed by row position
+    through a memory-mapped array of byte offsets, so a worker only reads the findings a
+    user drills into. Rows added by live ingestion are held in memory after the file's rows.
+    """
+
+    def __init__(self, path=None, tail=None):
+        self.path = path
+        self.offsets = np.load(path + '.offsets.npy', mmap_mode='r') if path else np.zeros(1, dtype=np.int64)
+        self.file_rows = len(self.offsets) - 1
+        self.tail = tail if tail is not None else pd.DataFrame()
+        # Held open so a cache rebuild by another worker (which writes a new file) cannot shift the offsets
+        self._fd = os.open(path, os.O_RDONLY | getattr(os, 'O_BINARY', 0)) if path else None
+        self._lock = threading.Lock()
+        # Every record carries every column, so the first one names them
+        columns = list(self._read(0).keys()) if self.file_rows else []
+        self.columns = columns + [c for c in self.tail.columns if c not in columns]
+
+    @staticmethod
+    def write(frame, path, chunksize=20_000):
+        """Write ``frame`` as ``path`` plus its ``.offsets.npy`` index (row i spans offsets[i]:offsets[i + 1])."""
+        ends = [np.zeros(1, dtype=np.int64)]
+        written = 0
+        with open(path, 'wb') as f:
+            for start in range(0, len(frame), chunksize):
+                data = frame.iloc[start:start + chunksize].to_json(orient='records', lines=True, date_format='iso')
+                data = data.encode('utf-8').rstrip(b'\n') + b'\n'
+                # JSON escapes newlines inside strings, so every newline ends a record
+                ends.append(np.flatnonzero(np.frombuffer(data, dtype=np.uint8) == 10).astype(np.int64) + written + 1)
+                f.write(data)
+                written += len(data)
+        np.save(path + '.offsets.npy', np.concatenate(ends))
+
+    def extended(self, rows):
+        store = copy.copy(self)
+        store.tail = rows.reset_index(drop=True) if self.tail.empty else pd.concat([self.tail, rows], ignore_index=True)
+        store.columns = self.columns + [c for c in rows.columns if c not in self.columns]
+        return store
+
+    def _read(self, position):
+        start, end = int(self.offsets[position]), int(self.offsets[position + 1])
+        if hasattr(os, 'pread'):
+            # Positional read: the descriptor is shared with workers forked after import (gunicorn --preload),
+            # so a seek + read could interleave with theirs
+            return json.loads(os.pread(self._fd, end - start, start))
+        with self._lock:
+            os.lseek(self._fd, start, os.SEEK_SET)
+            return json.loads(os.read(self._fd, end - start))
+
+    def __len__(self):
+        return self.file_rows + len(self.tail)
+
+    def rows(self, positions, columns=None):
+        """Detail columns of the findings at ``positions`` (row positions of the core frame), in that order."""
+        positions = np.asarray(positions, dtype=np.int64)
+        records = {}
+        for position in np.unique(positions[positions < self.file_rows]):
+            records[position] = self._read(position)
+        for position in positions[positions >= self.file_rows]:
+            records[position] = self.tail.iloc[position - self.file_rows].to_dict()
+        frame = pd.DataFrame([records[p] for p in positions], index=positions)
+        return frame if columns is None else frame.reindex(columns=columns)
+
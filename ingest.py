@@ -0,0 +1,269 @@
+import glob
+import io
+import logging
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+KEY_COLUMN = 'Unique ID'
+
+logger = logging.getLogger(__name__)
+
+
+def complete_records_end(data):
+    """Byte length of the complete CSV records at the start of ``data``.
+
+    Quoted fields (Source Code, Summary, ...) can contain newlines, so a record ends at the
+    last newline outside quotes, not at the last newline.
+    """
+    raw = np.frombuffer(data, dtype=np.uint8)
+    # An escaped quote ("") flips the state twice, so odd parity means inside a quoted field
+    quoted = np.cumsum(raw == ord('"')) % 2 == 1
+    ends = np.flatnonzero((raw == ord('\n')) & ~quoted)
+    return int(ends[-1]) + 1 if len(ends) else 0
+
+
+class LiveIngestor:
+    """Background watcher that feeds rows not seen before into the running dashboard.
+
+    input.csv is treated as append-only: when it grows only the bytes after the last
+    consumed offset are parsed. If it shrinks or is rewritten in place it is re-read
+    and filtered on the key column. Every ``*.csv`` dropped into ``drop_dir`` is read
+    once (again if its mtime changes); files already there are read by the first ``poll``,
+    since the loaded dataset does not include them. New rows are passed through ``clean``
+    and handed to ``on_rows``; rows removed from the exports are not retracted. A non-CSV
+    input (a merged .parquet) cannot be tailed, so then only ``drop_dir`` is watched.
+    """
+
+    def __init__(self, csv_path, df, clean, on_rows, drop_dir=None, key=KEY_COLUMN, interval=5.0, loaded_stat=None):
+        self.csv_path = csv_path
+        self.clean = clean
+        self.on_rows = on_rows
+        self.drop_dir = drop_dir
+        self.key = key
+        self.interval = interval
+        self.seen_keys = set(df[key].dropna())
+        if not csv_path.endswith('.csv'):
+            if not drop_dir:
+                raise ValueError(f"Cannot watch {csv_path}: only CSV inputs can be tailed, set a drop directory instead")
+            logger.warning("%s is not a CSV; watching only %s for new exports", csv_path, drop_dir)
+            self.csv_path = None
+        else:
+            self.columns = list(pd.read_csv(csv_path, nrows=0).columns)
+            # Start from the file as it was when ``df`` was loaded, so rows appended since are not skipped
+            stat = loaded_stat or os.stat(csv_path)
+            self.offset, self.mtime_ns = stat.st_size, stat.st_mtime_ns
+        self.seen_files = {}
+        self._stop = threading.Event()
+        self._thread = None
+        self._pid = None
+        self._start_lock = threading.Lock()
+
+    def _read_tail(self):
+        with open(self.csv_path, 'rb') as f:
+            f.seek(self.offset)
+            data = f.read()
+        # Only consume complete records so a half-written row is picked up on the next poll
+        end = complete_records_end(data)
+        if not end:
+            return None
+        rows = pd.read_csv(io.BytesIO(data[:end]), header=None, names=self.columns)
+        self.offset += end
+        return rows
+
+    def _read_changed(self):
+        frames = []
+        if self.csv_path:
+            stat = os.stat(self.csv_path)
+            if stat.st_size > self.offset:
+                frames.append(self._read_tail())
+            elif stat.st_size < self.offset or stat.st_mtime_ns != self.mtime_ns:
+                frames.append(pd.read_csv(self.csv_path))
+                self.offset = stat.st_size
+            self.mtime_ns = stat.st_mtime_ns
+
+        if self.drop_dir:
+            for path in sorted(glob.glob(os.path.join(self.drop_dir, '*.csv'))):
+                mtime_ns = os.stat(path).st_mtime_ns
+                if self.seen_files.get(path) != mtime_ns:
+                    frames.append(pd.read_csv(path))
+                    self.seen_files[path] = mtime_ns
+        return [f for f in frames if f is not None and len(f)]
+
+    def poll(self):
+        """Check the watched files once; return the number of new rows applied."""
+        frames = self._read_changed()
+        if not frames:
+            return 0
+        rows = pd.concat(frames, ignore_index=True)
+        rows = rows[rows[self.key].notna() & ~rows[self.key].isin(self.seen_keys)]
+        rows = rows.drop_duplicates(self.key).reset_index(drop=True)
+        if rows.empty:
+            return 0
+        self.on_rows(self.clean(rows))
+        self.seen_keys.update(rows[self.key])
+        return len(rows)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.poll()
+            except Exception:  # keep watching, a bad export must not kill the thread
+                logger.exception("Live ingestion of new axe rows failed")
+
+    def start(self):
+        """Start polling in this process; a no-op if it already polls here.
+
+        Threads do not survive fork, so a process forked from one that started the watcher
+        (e.g. a gunicorn worker under --preload) has to call this again.
+        """
+        with self._start_lock:
+            if self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._thread = threading.Thread(target=self._run, name='eaa-live-ingest', daemon=True)
+                self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+
+DEDUP_KEY = 'Unique string identifier'
+
+# Columns the dashboard reads; the long free-text fields (Selector, Source Code, URLs, ...) are skipped
+DASHBOARD_COLUMNS = [
+    'Impact', 'Test Title', 'Rule ID', 'Selector', 'Tags', 'Found By', 'Created At', 'Country', 'Brand',
+    'Unique string identifier', 'Unique ID',
+]
+
+
+def expand_sources(sources):
+    paths = []
+    for source in sources:
+        if os.path.isdir(source):
+            paths.extend(sorted(glob.glob(os.path.join(source, '*.csv'))))
+        else:
+            paths.extend(sorted(glob.glob(source)))
+    return list(dict.fromkeys(paths))
+
+
+class _KeySet:
+    """Hashed keys as sorted uint64 runs: 8 bytes per unique row instead of the key strings.
+
+    Each chunk adds a run; a run is merged into the one before it once that is no longer
+    larger, so there are O(log n) runs and every key is copied O(log n) times in total.
+    """
+
+    def __init__(self):
+        self.runs = []
+
+    def __len__(self):
+        return sum(len(run) for run in self.runs)
+
+    def contains(self, hashes):
+        found = np.zeros(len(hashes), dtype=bool)
+        for run in self.runs:
+            pos = np.searchsorted(run, hashes)
+            inside = pos < len(run)
+            found[inside] |= run[pos[inside]] == hashes[inside]
+        return found
+
+    def add(self, hashes):
+        if not len(hashes):
+            return
+        self.runs.append(np.sort(hashes))
+        while len(self.runs) > 1 and len(self.runs[-2]) <= len(self.runs[-1]):
+            run = self.runs.pop()
+            self.runs[-1] = np.sort(np.concatenate([self.runs[-1], run]), kind='stable')
+
+
+class _ParquetSink:
+    def __init__(self, path, columns):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self.pa = pa
+        fields = [pa.field(c, pa.int64() if c == 'Unique ID' else pa.string()) for c in columns]
+        self.schema = pa.schema(fields)
+        self.writer = pq.ParquetWriter(path, self.schema)
+
+    def write(self, chunk):
+        self.writer.write_table(self.pa.Table.from_pandas(chunk, schema=self.schema, preserve_index=False))
+
+    def close(self):
+        self.writer.close()
+
+
+class _CsvSink:
+    def __init__(self, path, columns):
+        self.path = path
+        pd.DataFrame(columns=columns).to_csv(path, index=False)
+
+    def write(self, chunk):
+        chunk.to_csv(self.path, mode='a', header=False, index=False)
+
+    def close(self):
+        pass
+
+
+def stream_exports(sources, out_path, chunksize=50_000, columns=DASHBOARD_COLUMNS, key=DEDUP_KEY):
+    """Merge many axe exports into one deduplicated file the dashboard can load.
+
+    Each export is read ``chunksize`` rows at a time with only ``columns`` parsed, so peak
+    memory depends on the chunk size plus 8 bytes per distinct key rather than on the total
+    input. Rows are deduplicated on ``key`` (rows without a key are kept) and appended to
+    ``out_path``, a ``.parquet`` file (needs pyarrow) or a ``.csv`` file. Returns run stats.
+    """
+    columns = list(columns)
+    if key not in columns:
+        columns.append(key)
+    paths = expand_sources(sources)
+    sink = (_ParquetSink if out_path.endswith('.parquet') else _CsvSink)(out_path, columns)
+    seen = _KeySet()
+    stats = {'files': len(paths), 'rows_read': 0, 'duplicates_dropped': 0, 'rows_written': 0,
+             'bytes_read': sum(os.path.getsize(p) for p in paths)}
+    started = time.perf_counter()
+
+    try:
+        for path in paths:
+            reader = pd.read_csv(path, usecols=lambda c: c in columns, dtype=str, chunksize=chunksize)
+            for chunk in reader:
+                stats['rows_read'] += len(chunk)
+                chunk = chunk.reindex(columns=columns)
+                has_key = chunk[key].notna().to_numpy()
+                hashes = pd.util.hash_pandas_object(chunk[key], index=False).to_numpy()
+                first = ~pd.Series(hashes).duplicated().to_numpy() | ~has_key
+                keep = first & ~(seen.contains(hashes) & has_key)
+                seen.add(hashes[keep & has_key])
+                chunk = chunk[keep].copy()
+                if 'Unique ID' in chunk:
+                    chunk['Unique ID'] = pd.to_numeric(chunk['Unique ID'], errors='coerce').astype('Int64')
+                stats['duplicates_dropped'] += int((~keep).sum())
+                stats['rows_written'] += len(chunk)
+                sink.write(chunk)
+    finally:
+        sink.close()
+
+    stats['seconds'] = time.perf_counter() - started
+    stats['rows_per_second'] = stats['rows_read'] / stats['seconds'] if stats['seconds'] else 0.0
+    stats['mb_per_second'] = stats['bytes_read'] / 1e6 / stats['seconds'] if stats['seconds'] else 0.0
+    return stats
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Merge and deduplicate axe exports for the EAA dashboard")
+    parser.add_argument('sources', nargs='+', help="export CSVs, directories of exports or glob patterns")
+    parser.add_argument('-o', '--output', default='input.parquet', help="output .parquet or .csv file")
+    parser.add_argument('--chunksize', type=int, default=50_000)
+    parser.add_argument('--key', default=DEDUP_KEY, help="column to deduplicate on")
+    args = parser.parse_args()
+
+    stats = stream_exports(args.sources, args.output, chunksize=args.chunksize, key=args.key)
+    print(f"{stats['files']} files, {stats['rows_read']} rows read, {stats['duplicates_dropped']} duplicates dropped, "
+          f"{stats['rows_written']} rows written in {stats['seconds']:.2f}s "
+          f"({stats['rows_per_second']:.0f} rows/s, {stats['mb_per_second']:.1f} MB/s)")
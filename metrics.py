@@ -0,0 +1,162 @@
+import functools
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+
+try:
+    import psutil
+except ImportError:  # psutil is optional, fall back to /proc or getrusage
+    psutil = None
+
+
+class _NoopTimer:
+    def lap(self, phase):
+        pass
+
+
+NOOP_TIMER = _NoopTimer()
+
+
+class _Timer:
+    def __init__(self, record):
+        self.record = record
+        self.last = time.perf_counter()
+
+    def lap(self, phase):
+        now = time.perf_counter()
+        self.record['phases'][phase] = self.record['phases'].get(phase, 0.0) + now - self.last
+        self.last = now
+
+
+class Metrics:
+    """Per-callback timings, response sizes and cache lookups, rendered in Prometheus text format.
+
+    ``instrument`` returns the callback unchanged when disabled, and ``timer`` hands out a
+    shared no-op, so a disabled instance costs one attribute lookup per phase.
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.phase_seconds = defaultdict(float)   # (callback, phase) -> total seconds
+        self.calls = defaultdict(int)             # callback -> calls
+        self.max_seconds = defaultdict(float)     # callback -> slowest call
+        self.response_bytes = defaultdict(int)    # callback -> total serialized bytes
+        self.responses = defaultdict(int)
+        self.cache_lookups = defaultdict(int)     # (callback, 'hit'|'miss') -> count
+
+    def instrument(self, name):
+        def decorator(func):
+            if not self.enabled:
+                return func
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                record = {'callback': name, 'phases': {}, 'cache': None}
+                self._local.record = record
+                started = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    record['phases']['total'] = time.perf_counter() - started
+                    self._observe(record)
+            return wrapper
+        return decorator
+
+    def timer(self):
+        record = getattr(self._local, 'record', None) if self.enabled else None
+        return NOOP_TIMER if record is None else _Timer(record)
+
+    def record_cache(self, name, hit):
+        if not self.enabled:
+            return
+        record = getattr(self._local, 'record', None)
+        if record is not None:
+            record['cache'] = 'hit' if hit else 'miss'
+        with self._lock:
+            self.cache_lookups[(name, 'hit' if hit else 'miss')] += 1
+
+    def _observe(self, record):
+        name = record['callback']
+        with self._lock:
+            self.calls[name] += 1
+            self.max_seconds[name] = max(self.max_seconds[name], record['phases']['total'])
+            for phase, seconds in record['phases'].items():
+                self.phase_seconds[(name, phase)] += seconds
+
+    def after_request(self, response):
+        """Flask after_request hook: response size and a Server-Timing header for callback requests."""
+        record = getattr(self._local, 'record', None)
+        if record is None:
+            return response
+        self._local.record = None
+        size = response.calculate_content_length() or 0
+        with self._lock:
+            self.response_bytes[record['callback']] += size
+            self.responses[record['callback']] += 1
+        timings = [f"{phase};dur={seconds * 1000:.2f}" for phase, seconds in record['phases'].items()]
+        if record['cache']:
+            timings.append(f'cache;desc="{record["cache"]}"')
+        response.headers['Server-Timing'] = ', '.join(timings)
+        return response
+
+    def render(self, gauges=()):
+        """Prometheus exposition text; ``gauges`` adds (name, help, value) process/dataset gauges."""
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+            for labels, value in samples:
+                label_text = ','.join(f'{k}="{v}"' for k, v in labels.items())
+                lines.append(f'{name}{{{label_text}}} {value}' if label_text else f'{name} {value}')
+
+        with self._lock:
+            metric('eaa_callback_phase_seconds_total', 'counter', 'Time spent per callback phase.',
+                   [({'callback': c, 'phase': p}, f'{s:.6f}') for (c, p), s in sorted(self.phase_seconds.items())])
+            metric('eaa_callback_calls_total', 'counter', 'Instrumented callback invocations.',
+                   [({'callback': c}, n) for c, n in sorted(self.calls.items())])
+            metric('eaa_callback_max_seconds', 'gauge', 'Slowest invocation per callback.',
+                   [({'callback': c}, f'{s:.6f}') for c, s in sorted(self.max_seconds.items())])
+            metric('eaa_callback_response_bytes_total', 'counter', 'Serialized callback response bytes.',
+                   [({'callback': c}, n) for c, n in sorted(self.response_bytes.items())])
+            metric('eaa_callback_responses_total', 'counter', 'Callback responses measured.',
+                   [({'callback': c}, n) for c, n in sorted(self.responses.items())])
+            metric('eaa_callback_cache_lookups_total', 'counter', 'Result cache lookups per callback.',
+                   [({'callback': c, 'result': r}, n) for (c, r), n in sorted(self.cache_lookups.items())])
+        for name, help_text, value in gauges:
+            metric(name, 'gauge', help_text, [({}, value)])
+        rss = process_rss()
+        if rss is not None:
+            metric('eaa_process_resident_memory_bytes', 'gauge', 'Resident set size of this worker.', [({}, rss)])
+        return '\n'.join(lines) + '\n'
+
+
+def process_rss():
+    """Resident set size in bytes, or None where it cannot be read (Windows without psutil)."""
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except OSError:
+        # Peak rather than current RSS
+        return peak_rss()
+
+
+def peak_rss():
+    """Peak resident set size in bytes, or None where it cannot be read (Windows without psutil)."""
+    if psutil is not None:
+        peak = getattr(psutil.Process().memory_info(), 'peak_wset', None)  # only reported on Windows
+        if peak is not None:
+            return peak
+    try:
+        import resource
+    except ImportError:
+        return None
+    # macOS reports bytes, other platforms KiB
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
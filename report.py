@@ -0,0 +1,131 @@
+"""Headless batch reports: one self-contained HTML page per Test Title and/or Brand.
+
+    python report.py --by test-title --by brand -o reports -j 8
+
+The dataset is loaded once by importing EAA; worker processes are forked from this
+process, so they share the loaded frame and aggregates instead of re-reading input.csv.
+Where fork is unavailable (Windows) a spawned worker would import EAA and load everything
+again, so the reports are rendered in this process instead and -j has no effect.
+"""
+import argparse
+import hashlib
+import html
+import multiprocessing
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import plotly.graph_objects as go
+import plotly.io as pio
+from plotly.offline import get_plotlyjs
+
+import EAA
+
+GROUPINGS = {'test-title': 'Test Title', 'brand': 'Brand'}
+
+HEADER_STYLE = 'padding: 10px; background-color: #2c3e50; color: white;'
+CELL_STYLE = 'padding: 8px; border: 1px solid #ddd; text-align: center;'
+
+PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+</head>
+<body style="font-family: Arial, sans-serif; color: #2c3e50;">
+<h1 style="text-align: center;">{title}</h1>
+<p style="text-align: center; font-size: 18px; font-weight: bold; white-space: pre-line;">{summary}</p>
+{figure}
+<h2 style="text-align: center;">Rule breakdown</h2>
+{breakdown}
+<h2 style="text-align: center;">Accessibility Effort Estimates</h2>
+{efforts}
+</body>
+</html>
+"""
+
+
+def slugify(value):
+    return re.sub(r'[^A-Za-z0-9]+', '-', str(value)).strip('-').lower() or 'report'
+
+
+def report_filename(dim, value):
+    # The slug folds case and punctuation ("Claim T&Cs" / "claim t cs"), so a hash of the raw value keeps names apart
+    digest = hashlib.sha1(str(value).encode('utf-8')).hexdigest()[:8]
+    return f'{slugify(dim)}--{slugify(value)}-{digest}.html'
+
+
+def html_table(headers, rows):
+    head = ''.join(f'<th style="{HEADER_STYLE}">{html.escape(h)}</th>' for h in headers)
+    body = ''.join(
+        '<tr>' + ''.join(f'<td style="{CELL_STYLE}">{html.escape(str(v))}</td>' for v in row) + '</tr>'
+        for row in rows
+    )
+    return (f'<table style="margin: auto; border-collapse: collapse; width: 80%; font-size: 16px;">'
+            f'<tr>{head}</tr>{body}</table>')
+
+
+def render_report(dim, value, include_plotlyjs):
+    filters = {dim: [value]}
+    figure, summary = EAA.build_chart(filters)
+    title = f"Issues for {value}"
+    fig = go.Figure({**figure, 'layout': {**figure['layout'], 'title': {'text': title}}})
+    breakdown, _ = EAA.build_category_breakdown(filters)
+
+    return PAGE.format(
+        title=html.escape(title),
+        summary=html.escape(summary),
+        figure=pio.to_html(fig, full_html=False, include_plotlyjs=include_plotlyjs),
+        breakdown=html_table(['Rule ID', 'Severity', 'Count'], breakdown.itertuples(index=False)),
+        efforts=html_table(['Category', 'Difficulty', 'Effort Required'], EAA.effort_estimates),
+    )
+
+
+def write_report(task):
+    dim, value, out_dir, include_plotlyjs = task
+    path = os.path.join(out_dir, report_filename(dim, value))
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(render_report(dim, value, include_plotlyjs))
+    return dim, value, path
+
+
+def generate_reports(groupings, out_dir, jobs=None, include_plotlyjs=True):
+    """Render every group of every grouping across a process pool; returns [(dim, value, path)]."""
+    os.makedirs(out_dir, exist_ok=True)
+    tasks = [(dim, value, out_dir, include_plotlyjs)
+             for dim in groupings for value in EAA.state.filter_engine.values(dim)]
+    if include_plotlyjs == 'directory':
+        # Written once up front; each report then references ./plotly.min.js
+        with open(os.path.join(out_dir, 'plotly.min.js'), 'w', encoding='utf-8') as f:
+            f.write(get_plotlyjs())
+
+    if 'fork' in multiprocessing.get_all_start_methods():
+        with ProcessPoolExecutor(max_workers=jobs, mp_context=multiprocessing.get_context('fork')) as pool:
+            results = list(pool.map(write_report, tasks, chunksize=max(1, len(tasks) // (4 * (jobs or os.cpu_count() or 1)))))
+    else:
+        results = [write_report(task) for task in tasks]
+
+    index_rows = ''.join(
+        f'<li><a href="{html.escape(os.path.basename(path))}">{html.escape(dim)}: {html.escape(str(value))}</a></li>'
+        for dim, value, path in results
+    )
+    with open(os.path.join(out_dir, 'index.html'), 'w', encoding='utf-8') as f:
+        f.write(f'<!DOCTYPE html><html><head><meta charset="utf-8"><title>Accessibility reports</title></head>'
+                f'<body style="font-family: Arial, sans-serif;"><h1>Accessibility reports</h1><ul>{index_rows}</ul></body></html>')
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render static per-group accessibility reports")
+    parser.add_argument('--by', action='append', choices=sorted(GROUPINGS), help="grouping (repeatable, default test-title)")
+    parser.add_argument('-o', '--output', default='reports', help="output directory")
+    parser.add_argument('-j', '--jobs', type=int, default=None, help="worker processes (default: CPU count; needs fork, ignored on Windows)")
+    parser.add_argument('--shared-plotlyjs', action='store_true',
+                        help="write plotly.min.js once next to the reports instead of inlining it in each one")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    results = generate_reports([GROUPINGS[b] for b in args.by or ['test-title']], args.output, args.jobs,
+                               'directory' if args.shared_plotlyjs else True)
+    print(f"{len(results)} reports written to {args.output} in {time.perf_counter() - started:.1f}s")
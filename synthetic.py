@@ -0,0 +1,170 @@
+"""Synthetic axe exports for load testing, in the same 24-column layout as input.csv.
+
+    python synthetic.py 1000000 -o synthetic-1m.csv --titles 2000 --brands 40 --countries 12
+
+Rule-level columns (Rule ID, Impact, Help, Description, Summary, Tags, IGT, ...) are copied
+from rows of a template export, so the Rule ID frequencies, Impact skew per rule and
+Tags lists match real audits. Test Titles, Brands, Countries, auditors, selectors,
+source snippets and timestamps are generated around them. Output is deterministic for
+a given seed and template.
+"""
+import argparse
+import csv
+import random
+import time
+
+import numpy as np
+import pandas as pd
+
+from dataset import read_source
+
+RULE_COLUMNS = ['Impact', 'Help URL', 'Rule ID', 'Description', 'Help', 'Manual', 'Needs Review', 'IGT',
+                'Summary', 'Tags']
+
+PAGE_NAMES = [
+    'Home', 'Search results', 'Product listing', 'Product details', 'Basket', 'Checkout', 'Login', 'Register',
+    'My account', 'Contact us', 'Store locator', 'FAQ', 'Claims', 'Get a quote', 'Policy documents', 'Cookie banner',
+    'Navigation menu', 'Footer', 'Newsletter signup', 'Accordions', 'Carousel', 'Video player', 'Date picker',
+]
+COUNTRY_NAMES = [
+    'Ireland', 'United Kingdom', 'France', 'Germany', 'Spain', 'Italy', 'Belgium', 'Netherlands', 'Portugal',
+    'Switzerland', 'Austria', 'Poland', 'Czechia', 'Greece', 'Sweden', 'Denmark', 'Finland', 'Norway',
+]
+TAGS = ['div', 'section', 'article', 'nav', 'ul', 'li', 'form', 'fieldset', 'span', 'button', 'a', 'img',
+        'input', 'label', 'header', 'footer', 'main', 'aside', 'table', 'td']
+CLASS_WORDS = ['container', 'row', 'col', 'card', 'grid', 'list', 'item', 'panel', 'wrapper', 'content',
+               'header', 'footer', 'nav', 'menu', 'link', 'btn', 'form', 'field', 'icon', 'media', 'hero', 'tile']
+
+
+def _weights(n, skew):
+    # Zipf-like: a handful of pages/brands account for most findings, as in real audit backlogs
+    w = 1.0 / np.arange(1, n + 1) ** skew
+    return w / w.sum()
+
+
+def _selector_component(rnd):
+    parts = ['body']
+    for depth in range(rnd.randint(6, 14)):
+        words = rnd.sample(CLASS_WORDS, rnd.randint(1, 3))
+        block = f'{words[0]}-{rnd.randrange(100)}'
+        classes = ''.join(f'.{block}__{w}' for w in words[1:])
+        ident = f'#{block}' if rnd.random() < 0.15 else ''
+        parts.append(f'{rnd.choice(TAGS)}{ident}.{block}{classes}:nth-of-type({rnd.randint(1, 7)})')
+    return ' > '.join(parts)
+
+
+def _source_snippet(rnd, selector):
+    leaf = selector.rsplit(' > ', 1)[-1].split(':', 1)[0]
+    tag, _, classes = leaf.partition('.')
+    tag = tag.split('#', 1)[0]
+    attrs = f' class="{classes.replace(".", " ")}" data-component="{"-".join(rnd.sample(CLASS_WORDS, 3))}"'
+    if tag == 'img':
+        return f'<img{attrs} src="/assets/images/{rnd.randrange(10 ** 6)}.jpg" width="{rnd.randrange(40, 1200)}">'
+    if tag in ('input', 'button'):
+        return f'<{tag}{attrs} type="{"submit" if tag == "button" else "text"}" id="f{rnd.randrange(10 ** 5)}">'
+    if tag == 'a':
+        return f'<a{attrs} href="/{"/".join(rnd.sample(CLASS_WORDS, 2))}" target="_self">'
+    return f'<{tag}{attrs} aria-hidden="{rnd.choice(["true", "false"])}">'
+
+
+class ExportGenerator:
+    """Generates synthetic findings chunk by chunk; see the module docstring."""
+
+    def __init__(self, template, seed=0, titles=500, brands=25, countries=12, auditors=40, components=20_000,
+                 start='2024-01-01', days=540):
+        self.template = template.reset_index(drop=True)
+        self.columns = list(template.columns)
+        self.rng = np.random.default_rng(seed)
+        rng = self.rng
+
+        country_names = [COUNTRY_NAMES[i % len(COUNTRY_NAMES)] + (f' {i // len(COUNTRY_NAMES) + 1}' if i >= len(COUNTRY_NAMES) else '')
+                         for i in range(countries)]
+        self.brand_names = np.array([f'Brand {i + 1:03d}' for i in range(brands)], dtype=object)
+        self.brand_countries = np.array(country_names, dtype=object)[rng.integers(countries, size=brands)]
+        title_brands = rng.choice(brands, size=titles, p=_weights(brands, 0.8))
+        pages = rng.integers(len(PAGE_NAMES), size=titles)
+        self.titles = np.array([f'{self.brand_names[b].upper()} - {PAGE_NAMES[p]} {i + 1}'
+                                for i, (b, p) in enumerate(zip(title_brands, pages))], dtype=object)
+        self.title_urls = np.array([f'https://www.brand-{b + 1:03d}.example/{PAGE_NAMES[p].lower().replace(" ", "-")}/{i + 1}'
+                                    for i, (b, p) in enumerate(zip(title_brands, pages))], dtype=object)
+        self.title_brands = title_brands
+        self.title_weights = _weights(titles, 1.0)
+        # Each page is audited on a few days; findings of a page share those timestamps
+        self.title_audits = np.datetime64(start, 'ms') + rng.integers(days, size=(titles, 3)) * np.timedelta64(1, 'D') \
+            + rng.integers(8 * 3600_000, 18 * 3600_000, size=(titles, 3)).astype('timedelta64[ms]')
+        self.auditors = np.array([f'auditor{i + 1:02d}@accessibility.example' for i in range(auditors)], dtype=object)
+        self.brand_auditors = rng.integers(auditors, size=brands)
+
+        rnd = random.Random(seed)
+        self.selectors = np.array([_selector_component(rnd) for _ in range(components)], dtype=object)
+        self.snippets = np.array([_source_snippet(rnd, s) for s in self.selectors], dtype=object)
+        self.next_id = 1
+
+    def chunk(self, n):
+        rng = self.rng
+        rows = self.template.iloc[rng.integers(len(self.template), size=n)].reset_index(drop=True)
+        out = pd.DataFrame({c: rows[c] if c in RULE_COLUMNS else None for c in self.columns})
+
+        title = rng.choice(len(self.titles), size=n, p=self.title_weights)
+        brand = self.title_brands[title]
+        out['Test Title'] = self.titles[title]
+        out['Test URL'] = self.title_urls[title]
+        out['Brand'] = self.brand_names[brand]
+        out['Country'] = self.brand_countries[brand]
+        # Mostly the brand's usual auditor, sometimes someone else
+        auditor = np.where(rng.random(n) < 0.8, self.brand_auditors[brand], rng.integers(len(self.auditors), size=n))
+        out['Found By'] = self.auditors[auditor]
+        out['Created At'] = np.char.add(np.datetime_as_string(self.title_audits[title, rng.integers(3, size=n)], unit='ms'), 'Z')
+
+        # Same component repeated across list items: one structural path, many nth-of-type indices
+        component = rng.integers(len(self.selectors), size=n)
+        leaf = rng.integers(1, 40, size=n)
+        selectors = [f'["{s} > span:nth-of-type({i})"]' for s, i in zip(self.selectors[component], leaf)]
+        out['Selector'] = selectors
+        out['Source Code'] = self.snippets[component]
+        ids = self.next_id + np.arange(n)
+        tokens = rng.integers(0, 2 ** 63, size=(n, 2))
+        out['Screenshot URL'] = [f'https://axe.example/api/screenshots/{a:016x}{b:016x}' for a, b in tokens]
+        out['Share URL'] = [f'https://axe.example/issues/{b:016x}{i:08x}' for (_, b), i in zip(tokens, ids)]
+        out['Unique string identifier'] = [f'{r}{s}{t}' for r, s, t in zip(rows['Rule ID'], selectors, out['Test Title'])]
+        out['Unique ID'] = ids
+        self.next_id += n
+        return out
+
+
+def raw_header(path):
+    # The template's header as written, so blank column names stay blank in the output
+    with open(path, encoding='utf-8-sig', newline='') as f:
+        return next(csv.reader(f))
+
+
+def generate_export(out_path, rows, template_path='input.csv', chunksize=100_000, **options):
+    """Write ``rows`` synthetic findings to ``out_path`` (.csv) and return the elapsed seconds."""
+    template = read_source(template_path)
+    generator = ExportGenerator(template, **options)
+    header = raw_header(template_path) if template_path.endswith('.csv') else generator.columns
+    started = time.perf_counter()
+    with open(out_path, 'w', encoding='utf-8', newline='') as f:
+        csv.writer(f).writerow(header)
+        remaining = rows
+        while remaining > 0:
+            chunk = generator.chunk(min(chunksize, remaining))
+            chunk.to_csv(f, header=False, index=False)
+            remaining -= len(chunk)
+    return time.perf_counter() - started
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic axe export for load testing")
+    parser.add_argument('rows', type=int)
+    parser.add_argument('-o', '--output', default='synthetic.csv')
+    parser.add_argument('--template', default='input.csv', help="export whose rule columns are sampled")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--titles', type=int, default=500)
+    parser.add_argument('--brands', type=int, default=25)
+    parser.add_argument('--countries', type=int, default=12)
+    args = parser.parse_args()
+
+    seconds = generate_export(args.output, args.rows, args.template, seed=args.seed, titles=args.titles,
+                              brands=args.brands, countries=args.countries)
+    print(f"{args.rows} rows written to {args.output} in {seconds:.1f}s")
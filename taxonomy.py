@@ -0,0 +1,109 @@
+import fnmatch
+import hashlib
+import os
+import re
+
+import pandas as pd
+
+DEFAULT_CATEGORY = 'Other'
+
+
+class RuleTaxonomy:
+    """Rule ID -> Rule Category mapping loaded from rules.txt.
+
+    The file has ``[Category]`` sections listing exact Rule IDs and glob patterns, one per
+    line (``#`` starts a comment). Exact IDs win over patterns, then the first matching
+    pattern in file order. Patterns are compiled once when the file is loaded.
+    """
+
+    def __init__(self, exact, patterns, default=DEFAULT_CATEGORY, source=''):
+        self.exact = dict(exact)
+        self.patterns = [(pattern, re.compile(fnmatch.translate(pattern)), category) for pattern, category in patterns]
+        self.default = default
+        self.fingerprint = hashlib.sha256(source.encode()).hexdigest()
+
+    @classmethod
+    def parse(cls, text):
+        exact, patterns, category = {}, [], None
+        for number, line in enumerate(text.splitlines(), 1):
+            line = line.split('#', 1)[0].strip()
+            if not line:
+                continue
+            if line.startswith('[') and line.endswith(']'):
+                category = line[1:-1].strip()
+            elif category is None:
+                raise ValueError(f"rules line {number}: '{line}' is outside a [Category] section")
+            elif any(c in line for c in '*?['):
+                patterns.append((line, category))
+            else:
+                exact.setdefault(line, category)
+        return cls(exact, patterns, source=text)
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, encoding='utf-8') as f:
+            return cls.parse(f.read())
+
+    def classify(self, rule_id):
+        if rule_id in self.exact:
+            return self.exact[rule_id]
+        for _, regex, category in self.patterns:
+            if regex.match(rule_id):
+                return category
+        return self.default
+
+    def classify_column(self, rule_ids):
+        """Rule Category for every row, classifying each distinct Rule ID only once."""
+        rule_ids = rule_ids.astype('category')
+        labels = [self.classify(r) for r in rule_ids.cat.categories]
+        label_codes, label_names = pd.factorize(pd.Index(labels + [self.default], dtype=object))
+        codes = label_codes[rule_ids.cat.codes.to_numpy()]  # NaN Rule IDs (code -1) pick the default
+        categories = pd.Categorical.from_codes(codes, label_names).remove_unused_categories()
+        return pd.Series(categories, index=rule_ids.index, name='Rule Category')
+
+    def unmapped(self, rule_ids):
+        """Rule IDs that fell through to the default category, with their finding counts."""
+        counts = rule_ids.value_counts()
+        counts = counts[counts > 0]
+        unmapped = [r for r in counts.index if self.classify(r) == self.default and r not in self.exact]
+        return counts.loc[unmapped].rename_axis('Rule ID').reset_index(name='count')
+
+
+class TaxonomyFile:
+    """Keeps a RuleTaxonomy in sync with its file; ``check`` is cheap enough to call per request."""
+
+    def __init__(self, path, min_interval=2.0):
+        self.path = path
+        self.min_interval = min_interval
+        self.taxonomy = RuleTaxonomy.from_file(path)
+        self._mtime_ns = os.stat(path).st_mtime_ns
+        self._next_check = 0.0
+
+    def check(self, now):
+        """Return the reloaded taxonomy if the file changed since the last load, else None."""
+        if now < self._next_check:
+            return None
+        self._next_check = now + self.min_interval
+        mtime_ns = os.stat(self.path).st_mtime_ns
+        if mtime_ns == self._mtime_ns:
+            return None
+        self._mtime_ns = mtime_ns
+        taxonomy = RuleTaxonomy.from_file(self.path)
+        if taxonomy.fingerprint == self.taxonomy.fingerprint:
+            return None
+        self.taxonomy = taxonomy
+        return taxonomy
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="List Rule IDs in an export that rules.txt does not map")
+    parser.add_argument('data', nargs='?', default='input.csv', help="export (.csv or .parquet)")
+    parser.add_argument('--rules', default='rules.txt')
+    args = parser.parse_args()
+
+    from dataset import read_source
+
+    report = RuleTaxonomy.from_file(args.rules).unmapped(read_source(args.data)['Rule ID'].dropna())
+    print(report.to_string(index=False) if len(report) else "All Rule IDs are mapped.")